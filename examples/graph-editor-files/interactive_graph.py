@@ -1,4 +1,4 @@
-from ipymuvue.pyodide.vue import define_component, ref, watch
+from ipymuvue.pyodide.vue import define_component, ref, watch, event_fields
 
 
 def setup(props, context):
@@ -36,6 +36,7 @@ def setup(props, context):
         )
         dragged.value = None
 
+    @event_fields("offsetX", "offsetY")
     def drag(event):
         if dragged.value is not None:
             pos.value[dragged.value] = [event.offsetX, event.offsetY]
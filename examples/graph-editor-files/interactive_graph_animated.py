@@ -1,7 +1,7 @@
-from ipymuvue.pyodide.vue import define_component, ref, watch, vue_compatible
+from ipymuvue.pyodide.vue import define_component, ref, watch, event_fields, animate
 
 
-def create_setup(gsap):
+def create_setup():
     def setup(props, context):
         def vertex_rclick(vertex):
             context.emit("vertex-rclick", vertex)
@@ -13,18 +13,7 @@ def create_setup(gsap):
             pos.value = {
                 vertex: pos.value.get(vertex, new.get(vertex)) for vertex in new
             }
-            for vertex in new:
-                gsap.to(
-                    vue_compatible(pos.value[vertex]),
-                    vue_compatible(
-                        {
-                            "duration": 0.5,
-                            "0": new[vertex][0],
-                            "1": new[vertex][1],
-                        },
-                        reference=False,
-                    ),
-                )
+            animate(pos, new, duration=0.5)
 
         watch(lambda: props.positions, update_positions)
 
@@ -51,6 +40,7 @@ def create_setup(gsap):
             )
             dragged.value = None
 
+        @event_fields("offsetX", "offsetY")
         def drag(event):
             if dragged.value is not None:
                 pos.value[dragged.value] = [event.offsetX, event.offsetY]
@@ -60,9 +50,9 @@ def create_setup(gsap):
     return setup
 
 
-def create_component(gsap):
+def create_component():
     return define_component(
-        setup=create_setup(gsap),
+        setup=create_setup(),
         props=["vertices", "edges", "positions", "width", "height"],
         emits=["vertex-rclick", "rclick", "dragged"],
     )
@@ -50,3 +50,15 @@ def _jupyter_nbextension_paths():
             "require": "ipymuvue/extension",
         }
     ]
+
+
+def _jupyter_server_extension_points():
+    r"""
+    Called by the Jupyter server to find the extension that serves a local
+    copy of pyodide, see :mod:`ipymuvue.server`.
+    """
+    return [
+        {
+            "module": "ipymuvue.server",
+        }
+    ]
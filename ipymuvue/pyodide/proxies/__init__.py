@@ -2,8 +2,31 @@ from ipymuvue.pyodide.proxies.conversion import (
     vue_compatible,
     python_compatible,
     owner,
+    scope,
     create_proxy,
+    release_proxy,
+    shareable,
+    shared,
+    debug_proxies,
+    debugging_proxies,
+    proxy_statistics,
+    dump_proxies,
+    report_proxies,
 )
 
 
-__all__ = ["vue_compatible", "python_compatible", "owner", "create_proxy"]
+__all__ = [
+    "vue_compatible",
+    "python_compatible",
+    "owner",
+    "scope",
+    "create_proxy",
+    "release_proxy",
+    "shareable",
+    "shared",
+    "debug_proxies",
+    "debugging_proxies",
+    "proxy_statistics",
+    "dump_proxies",
+    "report_proxies",
+]
@@ -25,6 +25,7 @@ intercept some of the operations on an array.
 # ******************************************************************************
 
 from collections.abc import MutableSequence
+from contextlib import contextmanager
 from ipymuvue.pyodide.proxies import python_compatible, vue_compatible
 from ipymuvue.pyodide.types import is_vue_proxy
 
@@ -45,6 +46,56 @@ class ArrayWrapper(MutableSequence):
     def _vue_compatible(self, object):
         return vue_compatible(object)
 
+    def _converts_directly(self, value):
+        r"""
+        Return whether ``to_js`` turns ``value`` into what
+        :meth:`_vue_compatible` would return.
+        """
+        return type(value) in [int, str, float, bool, type(None)]
+
+    def _vue_compatible_items(self, items):
+        r"""
+        Return the list ``items`` as a JavaScript array whose entries have
+        been converted with :meth:`_vue_compatible`.
+
+        Only entries that ``to_js`` cannot convert directly, e.g., wrapped
+        JavaScript objects, are converted one by one. All other entries are
+        converted together with the array itself in a single call.
+        """
+        import js
+        import pyodide
+
+        return pyodide.ffi.to_js(
+            [
+                item if self._converts_directly(item) else self._vue_compatible(item)
+                for item in items
+            ],
+            dict_converter=js.Object.fromEntries,
+            create_pyproxies=False,
+        )
+
+    def _vue_compatible_entries(self, entries):
+        r"""
+        Return the dict ``entries`` with string keys as a JavaScript object
+        whose values have been converted with :meth:`_vue_compatible`.
+
+        Like :meth:`_vue_compatible_items`, plain values are converted
+        together with the object in a single call.
+        """
+        import js
+        import pyodide
+
+        return pyodide.ffi.to_js(
+            {
+                key: value
+                if self._converts_directly(value)
+                else self._vue_compatible(value)
+                for (key, value) in entries.items()
+            },
+            dict_converter=js.Object.fromEntries,
+            create_pyproxies=False,
+        )
+
     def insert(self, index, object):
         if index < 0:
             index = 0
@@ -53,8 +104,41 @@ class ArrayWrapper(MutableSequence):
         self._array.splice(index, 0, self._vue_compatible(object))
 
     def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step < 0:
+                return self._items()[index]
+            items = self._array.slice(start, stop).to_py(depth=1)
+            return [python_compatible(item) for item in items[::step]]
+
         return python_compatible(self._array[index])
 
+    def __iter__(self):
+        return iter(self._items())
+
+    def _items(self):
+        r"""
+        Return the entries of this array as a Python list of wrapped entries.
+
+        The array itself is transferred to Python in a single call but its
+        entries are wrapped with :func:`python_compatible`, i.e., nested
+        arrays and objects are not copied.
+        """
+        return [python_compatible(item) for item in self._array.to_py(depth=1)]
+
+    def snapshot(self):
+        r"""
+        Return a deep copy of this array as a Python list.
+
+        The copy is created in a single call into JavaScript and does not
+        track changes to the underlying JavaScript array. This is much faster
+        than iterating over this array when reading large amounts of data.
+        """
+        # Load helper implemented in TypeScript in ipymuvue_js.ts
+        from ipymuvue_js import toPlain
+
+        return toPlain(self._array).to_py()
+
     def __setitem__(self, index, value):
         if index < 0:
             index = len(self) + index
@@ -63,7 +147,69 @@ class ArrayWrapper(MutableSequence):
         if index >= len(self):
             raise IndexError("assignment index out of range")
 
-        self._array[index] = self._vue_compatible(object)
+        self._array[index] = self._vue_compatible(value)
+
+    def extend(self, values):
+        r"""
+        Append all ``values`` to this array.
+
+        The values are converted like single appends would. However, plain
+        values such as numbers, lists, and dicts are converted together in a
+        single call into JavaScript and appended with another single call.
+        """
+        values = list(values)
+
+        if not values:
+            return
+
+        # Load helper implemented in TypeScript in ipymuvue_js.ts
+        from ipymuvue_js import append
+
+        append(self._array, self._vue_compatible_items(values), None)
+
+    def update_many(self, changes):
+        r"""
+        Set the entries of this array at the indexes given as the keys of the
+        dict ``changes`` to the corresponding values.
+
+        The values are converted like single writes would. However, plain
+        values such as numbers, lists, and dicts are converted together in a
+        single call into JavaScript and written with another single call.
+        """
+        import js
+
+        length = len(self)
+
+        entries = {}
+        for (index, value) in changes.items():
+            if index < 0:
+                index = length + index
+            if index < 0:
+                raise IndexError("assignment index out of range")
+            if index >= length:
+                raise IndexError("assignment index out of range")
+            entries[str(index)] = value
+
+        if not entries:
+            return
+
+        js.Object.assign(self._array, self._vue_compatible_entries(entries))
+
+    @contextmanager
+    def collect_updates(self):
+        r"""
+        Collect the writes to the dict provided by this context and apply
+        them with :meth:`update_many` when the context exits::
+
+            with coordinates.collect_updates() as changes:
+                for (i, x) in enumerate(xs):
+                    changes[i] = x
+
+        Nothing is written if the context exits with an exception.
+        """
+        changes = {}
+        yield changes
+        self.update_many(changes)
 
     def __delitem__(self, index):
         if index < 0:
@@ -91,3 +237,86 @@ class ProxyList(ArrayWrapper):
 
     def _vue_compatible(self, object):
         return vue_compatible(object, reference=False)
+
+    def _converts_directly(self, value):
+        from ipymuvue.pyodide.proxies.conversion import _is_plain
+
+        return _is_plain(value)
+
+    # Inside a batch() writes to entries are deferred, see batching.py.
+    # Operations that read more than one entry or change the length of the
+    # array first perform the deferred writes.
+
+    def _flush(self):
+        from ipymuvue.pyodide.proxies.batching import pending
+
+        batch = pending()
+        if batch is not None:
+            batch.flush()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self._flush()
+        else:
+            from ipymuvue.pyodide.proxies.batching import pending
+
+            batch = pending()
+            if batch is not None:
+                found, value = batch.read(
+                    self._array, str(index if index >= 0 else len(self) + index)
+                )
+                if found:
+                    return value
+
+        return super().__getitem__(index)
+
+    def __setitem__(self, index, value):
+        from ipymuvue.pyodide.proxies.batching import pending
+
+        batch = pending()
+        if batch is None:
+            return super().__setitem__(index, value)
+
+        if index < 0:
+            index = len(self) + index
+        if index < 0:
+            raise IndexError("assignment index out of range")
+        if index >= len(self):
+            raise IndexError("assignment index out of range")
+
+        batch.write(self._array, str(index), value)
+
+    def __delitem__(self, index):
+        self._flush()
+        super().__delitem__(index)
+
+    def __iter__(self):
+        self._flush()
+        return super().__iter__()
+
+    def insert(self, index, object):
+        self._flush()
+        super().insert(index, object)
+
+    def extend(self, values):
+        self._flush()
+        super().extend(values)
+
+    def update_many(self, changes):
+        from ipymuvue.pyodide.proxies.batching import pending
+
+        batch = pending()
+        if batch is None:
+            return super().update_many(changes)
+
+        length = len(self)
+        for index in changes:
+            if not -length <= index < length:
+                raise IndexError("assignment index out of range")
+
+        for (index, value) in changes.items():
+            self.__setitem__(index, value)
+
+    def snapshot(self):
+        self._flush()
+        return super().snapshot()
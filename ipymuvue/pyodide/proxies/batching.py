@@ -0,0 +1,144 @@
+r"""
+Batches writes from Python into reactive Vue objects.
+
+Inside a :func:`batch`, writes to :class:`ProxyRef`, :class:`ProxyDict`, and
+:class:`ProxyList` are not performed immediately. Instead, they are collected
+and converted and applied with a single call into JavaScript when the batch
+ends.
+"""
+# ******************************************************************************
+# Copyright (c) 2022 Julian Rüth <julian.rueth@fsfe.org>
+#
+# ipymuvue is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ipymuvue is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ipymuvue. If not, see <https://www.gnu.org/licenses/>.
+# ******************************************************************************
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class Batch:
+    r"""
+    The writes collected during a :func:`batch`.
+    """
+
+    def __init__(self):
+        # Maps (identify(target), key) to (target, key, value) in the order
+        # in which the writes happened.
+        self._writes = {}
+
+    @staticmethod
+    def _key(target, key):
+        r"""
+        Return the key of a write to ``target[key]`` in ``_writes``.
+
+        We cannot use ``id(target)`` since pyodide creates a new JsProxy every
+        time the same JavaScript object crosses into Python.
+        """
+        # Load helper implemented in TypeScript in ipymuvue_js.ts
+        from ipymuvue_js import identify
+
+        return (identify(target), key)
+
+    def write(self, target, key, value):
+        r"""
+        Record that ``target[key]`` should be set to ``value``.
+
+        The ``target`` is a JavaScript object, ``key`` a string, and
+        ``value`` a Python value that has not been converted yet.
+        """
+        key_ = self._key(target, key)
+        self._writes.pop(key_, None)
+        self._writes[key_] = (target, key, value)
+
+    def read(self, target, key):
+        r"""
+        Return whether a write to ``target[key]`` is pending and the value
+        that is going to be written.
+        """
+        write = self._writes.get(self._key(target, key), None)
+
+        if write is None:
+            return False, None
+
+        return True, write[2]
+
+    def flush(self):
+        r"""
+        Perform all pending writes with a single call into JavaScript.
+        """
+        if not self._writes:
+            return
+
+        import pyodide
+
+        from ipymuvue.pyodide.proxies import vue_compatible
+
+        # Load helper implemented in TypeScript in ipymuvue_js.ts
+        from ipymuvue_js import applyBatch
+
+        targets, keys, values = zip(*self._writes.values())
+
+        # Each value is deep-cloned like an unbatched write would do it; only
+        # assembling the values into an array happens in a single call.
+        # Should a value not be convertible, the writes remain pending.
+        values = pyodide.ffi.to_js(
+            [vue_compatible(value, reference=False) for value in values]
+        )
+
+        self._writes = {}
+
+        applyBatch(
+            pyodide.ffi.to_js(list(targets)), pyodide.ffi.to_js(list(keys)), values
+        )
+
+
+_batch = ContextVar("batch", default=None)
+
+
+def pending():
+    r"""
+    Return the :class:`Batch` that is currently collecting writes or
+    ``None`` if writes should be performed immediately.
+    """
+    return _batch.get()
+
+
+@contextmanager
+def batch():
+    r"""
+    Collect writes to reactive Vue objects and perform them when this context
+    exits.
+
+    Reading a value that has been written in this context returns the
+    Python value written. Changes to the length of a :class:`ProxyList`
+    such as ``append`` or ``del`` are not batched; they first perform all the
+    writes collected so far.
+
+    Batches can be nested; writes are performed when the outermost batch
+    ends. If the outermost batch exits with an exception, the writes that
+    have not been performed yet are discarded (as with ``collect_updates()``
+    of wrapped JavaScript objects.)
+    """
+    if _batch.get() is not None:
+        yield
+        return
+
+    collecting = Batch()
+    token = _batch.set(collecting)
+    try:
+        yield
+    finally:
+        _batch.reset(token)
+
+    collecting.flush()
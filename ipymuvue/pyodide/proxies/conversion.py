@@ -31,21 +31,33 @@ communication between Python and Vue.js JavaScript API.
 # ******************************************************************************
 
 import js
+import itertools
+import weakref
 from contextvars import ContextVar
 from contextlib import contextmanager
 from ipymuvue.pyodide.types import is_vue_ref, is_vue_proxy
 
+# Load helper implemented in TypeScript in ipymuvue_js.ts
+from ipymuvue_js import identify
+
+# Maps the identifiers of JavaScript objects (see identify() in
+# ipymuvue_js.ts) to the Python wrappers that python_compatible() created for
+# them. A wrapper keeps its JavaScript object alive, so an entry is evicted
+# once Python does not hold on to the wrapper anymore.
+_wrappers = weakref.WeakValueDictionary()
+
 
 def python_compatible(x):
     r"""
     Wrap ``x`` that came out of a Vue API for use in Python.
+
+    Wrapping the same JavaScript object twice returns the same wrapper as
+    long as the first wrapper is still alive.
+
+    Typed arrays such as a ``Float64Array`` are copied into a ``memoryview``.
     """
     import pyodide
 
-    from ipymuvue.pyodide.proxies.object_wrapper import ObjectWrapper, ProxyDict
-    from ipymuvue.pyodide.proxies.array_wrapper import ArrayWrapper, ProxyList
-    from ipymuvue.pyodide.proxies.proxy_ref import ProxyRef
-
     # Some elementary types are converted automatically by pyodide.
     if type(x) in [int, str, float, bool, type(None)]:
         return x
@@ -56,6 +68,34 @@ def python_compatible(x):
         ), "received a function from Vue that is not defined in JavaScript"
         raise NotImplementedError("cannot properly wrap functions from the Vue API yet")
 
+    if x.typeof != "object":
+        raise Exception(f"not implemented, wrapping a proxy {x.typeof}")
+
+    key = identify(x)
+
+    wrapper = _wrappers.get(key, None)
+
+    if wrapper is None:
+        if js.ArrayBuffer.isView(x):
+            # Typed arrays such as Float64Array are copied into a memoryview.
+            return x.to_py()
+
+        wrapper = _wrap(x)
+        _wrappers[key] = wrapper
+
+    return wrapper
+
+
+def _wrap(x):
+    r"""
+    Return a new wrapper of the JavaScript object ``x`` for use in Python.
+
+    This is a helper for :func:`python_compatible`.
+    """
+    from ipymuvue.pyodide.proxies.object_wrapper import ObjectWrapper, ProxyDict
+    from ipymuvue.pyodide.proxies.array_wrapper import ArrayWrapper, ProxyList
+    from ipymuvue.pyodide.proxies.proxy_ref import ProxyRef
+
     if is_vue_ref(x):
         return ProxyRef(x)
 
@@ -64,12 +104,9 @@ def python_compatible(x):
             return ProxyList(x)
         return ArrayWrapper(x)
 
-    if x.typeof == "object":
-        if is_vue_proxy(x):
-            return ProxyDict(x)
-        return ObjectWrapper(x)
-
-    raise Exception(f"not implemented, wrapping a proxy {x.typeof}")
+    if is_vue_proxy(x):
+        return ProxyDict(x)
+    return ObjectWrapper(x)
 
 
 def vue_compatible(x, reference=True, shallow=False, owner=None):
@@ -91,6 +128,15 @@ def vue_compatible(x, reference=True, shallow=False, owner=None):
 
     If ``reference`` is ``None``, return whatever is chepest to accomplish.
 
+    One-dimensional numeric buffers such as NumPy arrays, ``array.array``, or
+    ``bytes`` are copied into a JavaScript typed array such as a
+    ``Float64Array``. 64-bit integers are copied into a ``Float64Array``
+    (if they can be represented exactly) instead of a ``BigInt64Array``
+    since BigInts do not mix with other numbers in JavaScript. Only if some
+    value exceeds 2**53 in absolute value, they are copied into a
+    ``BigInt64Array`` (or ``BigUint64Array``.) Note that Vue does not track
+    changes inside typed arrays.
+
     If a proxy of a callable gets created, its lifetime is tied to ``owner``,
     see :meth:`owner` for details.
     """
@@ -117,10 +163,32 @@ def vue_compatible(x, reference=True, shallow=False, owner=None):
         # Load helper implemented in TypeScript in ipymuvue_js.ts
         from ipymuvue_js import asVueCompatibleFunction
 
+        fields = getattr(x, "_event_fields", None)
+
+        if fields is None:
+            return asVueCompatibleFunction(
+                create_proxy(x, owner),
+                python_compatible_js,
+                vue_compatible_js,
+            )
+
+        # The fields of the event are extracted in JavaScript and passed as
+        # the first arguments, see event_fields() in vue.py.
+        import functools
+        import types
+
+        handler = x
+
+        @functools.wraps(handler)
+        def with_event_fields(*args):
+            event = types.SimpleNamespace(**dict(zip(fields, args)))
+            return handler(event, *args[len(fields) :])
+
         return asVueCompatibleFunction(
-            create_proxy(x, owner),
+            create_proxy(with_event_fields, owner),
             python_compatible_js,
             vue_compatible_js,
+            pyodide.ffi.to_js(list(fields)),
         )
 
     if isinstance(x, pyodide.ffi.JsProxy):
@@ -144,7 +212,26 @@ def vue_compatible(x, reference=True, shallow=False, owner=None):
     if isinstance(x, ArrayWrapper):
         return vue_compatible(x._array, reference=reference, shallow=shallow)
 
-    from collections.abc import Sequence
+    view = _typed_view(x)
+
+    if view is not None:
+        if reference is True:
+            raise TypeError(
+                "cannot call Vue API with this Python buffer; use vue_compatible(..., reference=False) to create a typed array copy that can be consumed by the Vue API"
+            )
+
+        # Copy numeric buffers such as NumPy arrays into a typed array such
+        # as a Float64Array in a single call.
+        return pyodide.ffi.to_js(view)
+
+    from collections.abc import Sequence, Mapping
+
+    if reference is not True and type(x) in [list, tuple, dict] and _is_plain(x):
+        # Convert plain JSON-like data in a single call into JavaScript
+        # instead of creating each array and object separately.
+        return pyodide.ffi.to_js(
+            x, dict_converter=js.Object.fromEntries, create_pyproxies=False
+        )
 
     if isinstance(x, Sequence):
         if reference is True:
@@ -157,8 +244,6 @@ def vue_compatible(x, reference=True, shallow=False, owner=None):
                 y.push(vue_compatible(item, reference=None, shallow=shallow))
             return y
 
-    from collections.abc import Mapping
-
     if isinstance(x, Mapping):
         if reference is True:
             raise TypeError(
@@ -181,8 +266,70 @@ def vue_compatible(x, reference=True, shallow=False, owner=None):
     raise NotImplementedError(f"cannot wrap this {type(x)} yet")
 
 
+def _is_plain(x):
+    r"""
+    Return whether ``x`` is made up only of lists, tuples, dicts with string
+    keys, and primitive values, i.e., whether it can be converted to
+    JavaScript by pyodide's ``to_js`` directly.
+    """
+    if type(x) in [int, str, float, bool, type(None)]:
+        return True
+
+    if type(x) in [list, tuple]:
+        return all(_is_plain(item) for item in x)
+
+    if type(x) is dict:
+        return all(
+            type(key) is str and _is_plain(value) for (key, value) in x.items()
+        )
+
+    return False
+
+
+def _typed_view(x):
+    r"""
+    Return a one-dimensional memoryview of ``x`` if ``x`` is numeric binary
+    data that can be represented as a JavaScript typed array, e.g., a NumPy
+    array, an ``array.array``, or ``bytes``. Otherwise, return ``None``.
+
+    64-bit integers are not turned into a ``BigInt64Array`` since BigInts
+    cannot be mixed with ordinary numbers in templates and JavaScript
+    arithmetic. Instead, they are copied into a ``Float64Array`` if all
+    values can be represented exactly. Otherwise, the 64-bit integers are
+    returned unchanged and become a ``BigInt64Array`` or ``BigUint64Array``
+    since there is no lossless alternative.
+    """
+    import array
+
+    if not isinstance(x, (bytes, bytearray, memoryview, array.array)) and not hasattr(
+        x, "__array_interface__"
+    ):
+        return None
+
+    view = memoryview(x)
+
+    format = view.format.lstrip("@=<")
+
+    if view.ndim != 1 or format not in list("bBhHiIlLqQfd"):
+        return None
+
+    if format in "lLqQ" and view.itemsize == 8:
+        values = view.tolist()
+        if all(abs(value) <= 2**53 for value in values):
+            return memoryview(array.array("d", values))
+
+    if not view.c_contiguous:
+        view = memoryview(view.tobytes()).cast(format)
+
+    return view
+
+
 _owner = ContextVar("owner", default=None)
 
+# The keys of the proxies created in the current scope and the name of the
+# component that created the scope, see scope().
+_scope = ContextVar("scope", default=None)
+
 
 @contextmanager
 def owner(owner):
@@ -197,6 +344,9 @@ def owner(owner):
 
     If ``owner`` is any other JavaScript object, we register it with a
     ``FinalizationRegistry`` in JavaScript.
+
+    Proxies created during this context are not recorded in any surrounding
+    :meth:`scope`.
     """
     import pyodide
 
@@ -210,12 +360,174 @@ def owner(owner):
         raise TypeError("owner must be None, a callable, or a JsProxy")
 
     token = _owner.set(owner)
+    scope_token = _scope.set(None)
     try:
         yield None
     finally:
+        _scope.reset(scope_token)
         _owner.reset(token)
 
 
+@contextmanager
+def scope(component=None):
+    r"""
+    Record the proxies created during this context.
+
+    Yields a list that collects the keys of the proxies that are created with
+    :meth:`create_proxy` during this context. The proxies are attributed to
+    ``component``, see :meth:`proxy_statistics`.
+    """
+    keys = []
+
+    token = _scope.set((keys, component))
+    try:
+        yield keys
+    finally:
+        _scope.reset(token)
+
+
+class ProxyRecord:
+    r"""
+    Bookkeeping for a proxy created with :meth:`create_proxy` that has not
+    been released yet.
+    """
+
+    def __init__(
+        self, proxy, target, owner, site, component=None, stack=None, identity=None
+    ):
+        self.proxy = proxy
+        self.target = target
+        self.owner = owner
+        # The identify() of the JavaScript object owning the proxy, if any.
+        self.identity = identity
+        self.site = site
+        self.component = component
+        self.stack = stack
+
+    def __repr__(self):
+        if self.component is not None:
+            return f"proxy of {self.target} created at {self.site} in {self.component} owned by {self.owner}"
+        return f"proxy of {self.target} created at {self.site} owned by {self.owner}"
+
+
+# The proxies created with create_proxy() that have not been released yet,
+# indexed by a unique key.
+_proxies = {}
+
+_keys = itertools.count()
+
+# Whether to record the full stack when creating proxies and to report
+# proxies that outlive their component, see debug_proxies().
+_debug = False
+
+
+def debug_proxies(enabled=True):
+    r"""
+    Enable or disable debugging of the lifetime of proxies.
+
+    When enabled, the full stack is recorded for every proxy created, see
+    :meth:`dump_proxies`, and a warning is printed to the JavaScript console
+    when proxies owned by a component are still alive after that component
+    has been unmounted.
+    """
+    global _debug
+    _debug = enabled
+
+
+def debugging_proxies():
+    r"""
+    Return whether debugging of proxies has been enabled with
+    :meth:`debug_proxies`.
+    """
+    return _debug
+
+
+def proxy_statistics(by="site"):
+    r"""
+    Return the number of proxies created with :meth:`create_proxy` that have
+    not been released yet.
+
+    Returns a ``collections.Counter`` that groups the proxies ``by`` the
+    ``"site"`` in the code that created them, their ``"owner"``, the
+    ``"target"`` that they are a proxy of, or the ``"component"`` whose
+    ``setup()`` created them.
+    """
+    if by not in ["site", "owner", "target", "component"]:
+        raise ValueError(f"cannot group proxies by {by}")
+
+    import collections
+
+    return collections.Counter(getattr(record, by) for record in _proxies.values())
+
+
+def dump_proxies(file=None):
+    r"""
+    Print all the proxies created with :meth:`create_proxy` that have not been
+    released yet to ``file`` (``sys.stdout`` by default.)
+
+    When debugging has been enabled with :meth:`debug_proxies`, the full stack
+    of the creation of each proxy is printed.
+    """
+    for key, record in _proxies.items():
+        print(f"{key}: {record}", file=file)
+        if record.stack is not None:
+            print("".join(record.stack), file=file)
+
+    print(f"{len(_proxies)} proxies alive", file=file)
+
+
+def report_proxies(owner, component, exclude=()):
+    r"""
+    Warn about the proxies owned by the JavaScript object ``owner`` of the
+    now unmounted ``component`` that have not been released yet.
+
+    Proxies with keys in ``exclude`` are not reported, e.g., because they are
+    going to be released shortly.
+    """
+    identity = identify(owner)
+    exclude = set(exclude)
+
+    alive = [
+        record
+        for (key, record) in _proxies.items()
+        if record.identity == identity and key not in exclude
+    ]
+
+    if alive:
+        js.console.warn(
+            f"{len(alive)} proxies created in {component} are still alive after it has been unmounted:\n"
+            + "\n".join(repr(record) for record in alive)
+        )
+
+
+def _site():
+    r"""
+    Return the file and line in the code outside of ipymuvue that caused the
+    current proxy to be created.
+    """
+    import os.path
+    import sys
+
+    package = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename.startswith(package):
+        frame = frame.f_back
+
+    if frame is None:
+        return "ipymuvue"
+
+    return f"{frame.f_code.co_filename}:{frame.f_lineno}"
+
+
+def _describe(x):
+    r"""
+    Return a short human-readable description of ``x`` for the bookkeeping of
+    proxies.
+    """
+    return getattr(x, "__qualname__", None) or type(x).__qualname__
+
+
 def create_proxy(x, owner=None):
     r"""
     Create a JavaScript JsProxy proxy of ``x`` (typically a callable.) This
@@ -224,6 +536,9 @@ def create_proxy(x, owner=None):
 
     If ``owner`` is ``None``, we try to deduce the ownership from a context
     variable. See :meth:`owner` for details.
+
+    The proxy is recorded until it is released, see :meth:`proxy_statistics`
+    and :meth:`dump_proxies`.
     """
     import pyodide
 
@@ -232,6 +547,41 @@ def create_proxy(x, owner=None):
     if owner is None:
         owner = _owner.get()
 
+    key = next(_keys)
+
+    identity = None
+
+    if owner is None:
+        description = "nobody"
+    elif callable(owner):
+        description = _describe(owner)
+    else:
+        # Note that we must not hold on to the owner itself since it would
+        # then never be garbage collected.
+        description = "JavaScript object"
+        identity = identify(owner)
+
+    stack = None
+    if _debug:
+        import traceback
+
+        stack = traceback.format_stack()
+
+    keys, component = _scope.get() or (None, None)
+
+    if keys is not None:
+        keys.append(key)
+
+    _proxies[key] = ProxyRecord(
+        proxy,
+        target=_describe(x),
+        owner=description,
+        site=_site(),
+        component=component,
+        stack=stack,
+        identity=identity,
+    )
+
     if owner is None:
         js.console.warn(
             f"No owner set when creating proxy of {x}. Memory will be leaked. Wrap your code in a `with ipymuvue.pyodide.proxies.owner(...)` context to avoid this warning."
@@ -240,23 +590,78 @@ def create_proxy(x, owner=None):
     elif callable(owner):
         owner(proxy)
     elif isinstance(owner, pyodide.JsProxy):
-        _registry.register(owner, proxy)
+        _registry.register(owner, key)
     else:
         raise NotImplementedError("cannot handle this kind of owner yet")
 
-    # Enable to understand memory leaks.
-    # print("created proxy for", x, "owner by", owner)
-
     return proxy
 
 
-def release_proxy(proxy):
-    # Enable to understand memory leaks.
-    # print("releasing proxy", proxy)
+# Vue compatible versions of callables that are shared between all instances
+# of components, see shared().
+_shared = {}
 
-    import pyodide
 
-    pyodide.ffi.destroy_proxies(js.Array.new([proxy]))
+def shareable(x):
+    r"""
+    Return whether ``x`` is a callable that does not capture any state, so
+    that a single proxy of it can be shared by all component instances.
+
+    This is the case for builtin functions (but not for builtin methods
+    bound to an object such as ``[].append``) and for functions that are not
+    closures and have no default arguments, in particular for functions
+    defined on the module level.
+    """
+    import types
+
+    if isinstance(x, types.BuiltinFunctionType):
+        return x.__self__ is None or isinstance(x.__self__, types.ModuleType)
+
+    return (
+        isinstance(x, types.FunctionType)
+        and x.__closure__ is None
+        and x.__defaults__ is None
+        and not x.__kwdefaults__
+        and set(x.__dict__) <= {"_event_fields"}
+    )
+
+
+def shared(x):
+    r"""
+    Return a Vue compatible version of the :meth:`shareable` callable ``x``.
+
+    The proxy of ``x`` is created only once and then reused. Functions that
+    are not closures and have the same code behave identically, so
+    functions defined without a closure in ``setup()`` are only proxied once
+    even though ``setup()`` creates a new function object every time.
+
+    The proxy is never released.
+    """
+    import types
+
+    key = (
+        (x.__code__, id(x.__globals__), getattr(x, "_event_fields", None))
+        if isinstance(x, types.FunctionType)
+        else x
+    )
+
+    if key not in _shared:
+        with owner(lambda proxy: None):
+            _shared[key] = vue_compatible(x)
+
+    return _shared[key]
+
+
+def release_proxy(key):
+    r"""
+    Destroy the proxy with ``key`` that was created with :meth:`create_proxy`.
+
+    Nothing happens if the proxy has already been released.
+    """
+    record = _proxies.pop(key, None)
+
+    if record is not None:
+        record.proxy.destroy()
 
 
 # Singleton proxies of these conversion functions with infinite lifetime
@@ -25,6 +25,7 @@ up in a Vue proxy without converting them to native JavaScript objects first.
 # ******************************************************************************
 
 from collections.abc import MutableMapping
+from contextlib import contextmanager
 
 
 class ObjectWrapper(MutableMapping):
@@ -43,6 +44,36 @@ class ObjectWrapper(MutableMapping):
 
         return vue_compatible(object)
 
+    def _converts_directly(self, value):
+        r"""
+        Return whether ``to_js`` turns ``value`` into what
+        :meth:`_vue_compatible` would return.
+        """
+        return type(value) in [int, str, float, bool, type(None)]
+
+    def _vue_compatible_entries(self, entries):
+        r"""
+        Return the dict ``entries`` with string keys as a JavaScript object
+        whose values have been converted with :meth:`_vue_compatible`.
+
+        Only values that ``to_js`` cannot convert directly, e.g., wrapped
+        JavaScript objects, are converted one by one. All other values are
+        converted together with the object itself in a single call.
+        """
+        import js
+        import pyodide
+
+        return pyodide.ffi.to_js(
+            {
+                key: value
+                if self._converts_directly(value)
+                else self._vue_compatible(value)
+                for (key, value) in entries.items()
+            },
+            dict_converter=js.Object.fromEntries,
+            create_pyproxies=False,
+        )
+
     def __delitem__(self, key):
         raise Exception("not implemented __delitem__")
 
@@ -63,6 +94,46 @@ class ObjectWrapper(MutableMapping):
     def __setitem__(self, key, value):
         self.__setattr__(key, value)
 
+    def update(self, other=(), **kwargs):
+        self.update_many(dict(other, **kwargs))
+
+    def update_many(self, changes):
+        r"""
+        Set all the keys of the dict ``changes`` to their values.
+
+        The values are converted like single writes would. However, plain
+        values such as numbers, lists, and dicts are converted together in a
+        single call into JavaScript and written with another single call.
+        """
+        import js
+
+        entries = {}
+        for (key, value) in changes.items():
+            if not isinstance(key, (int, str)):
+                raise TypeError(f"key must be int or str but was {type(key)}")
+            entries[str(key)] = value
+
+        if not entries:
+            return
+
+        js.Object.assign(self._object, self._vue_compatible_entries(entries))
+
+    @contextmanager
+    def collect_updates(self):
+        r"""
+        Collect the writes to the dict provided by this context and apply
+        them with :meth:`update_many` when the context exits::
+
+            with positions.collect_updates() as changes:
+                for vertex in vertices:
+                    changes[vertex] = layout(vertex)
+
+        Nothing is written if the context exits with an exception.
+        """
+        changes = {}
+        yield changes
+        self.update_many(changes)
+
     def __iter__(self):
         import js
 
@@ -78,6 +149,19 @@ class ObjectWrapper(MutableMapping):
         except AttributeError:
             raise KeyError(key)
 
+    def snapshot(self):
+        r"""
+        Return a deep copy of this object as a Python dict.
+
+        The copy is created in a single call into JavaScript and does not
+        track changes to the underlying JavaScript object. This is much faster
+        than iterating over this object when reading large amounts of data.
+        """
+        # Load helper implemented in TypeScript in ipymuvue_js.ts
+        from ipymuvue_js import toPlain
+
+        return toPlain(self._object).to_py()
+
 
 class ProxyDict(ObjectWrapper):
     r"""
@@ -96,3 +180,68 @@ class ProxyDict(ObjectWrapper):
         from ipymuvue.pyodide.proxies import vue_compatible
 
         return vue_compatible(object, reference=False)
+
+    def _converts_directly(self, value):
+        from ipymuvue.pyodide.proxies.conversion import _is_plain
+
+        return _is_plain(value)
+
+    # Inside a batch() writes to keys are deferred, see batching.py.
+    # Operations that read more than one key first perform the deferred
+    # writes.
+
+    def _flush(self):
+        from ipymuvue.pyodide.proxies.batching import pending
+
+        batch = pending()
+        if batch is not None:
+            batch.flush()
+
+    def __getattr__(self, key):
+        from ipymuvue.pyodide.proxies.batching import pending
+
+        batch = pending()
+        if batch is not None:
+            found, value = batch.read(self._object, str(key))
+            if found:
+                return value
+
+        return super().__getattr__(key)
+
+    def __setattr__(self, key, value):
+        from ipymuvue.pyodide.proxies.batching import pending
+
+        batch = pending()
+        if batch is None:
+            return super().__setattr__(key, value)
+
+        if not isinstance(key, (int, str)):
+            raise TypeError(f"key must be int or str but was {type(key)}")
+
+        batch.write(self._object, str(key), value)
+
+    def __iter__(self):
+        self._flush()
+        return super().__iter__()
+
+    def __len__(self):
+        self._flush()
+        return super().__len__()
+
+    def update_many(self, changes):
+        from ipymuvue.pyodide.proxies.batching import pending
+
+        batch = pending()
+        if batch is None:
+            return super().update_many(changes)
+
+        for key in changes:
+            if not isinstance(key, (int, str)):
+                raise TypeError(f"key must be int or str but was {type(key)}")
+
+        for (key, value) in changes.items():
+            self.__setattr__(key, value)
+
+    def snapshot(self):
+        self._flush()
+        return super().snapshot()
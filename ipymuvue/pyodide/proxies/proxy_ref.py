@@ -37,6 +37,14 @@ class ProxyRef:
 
     @property
     def value(self):
+        from ipymuvue.pyodide.proxies.batching import pending
+
+        batch = pending()
+        if batch is not None:
+            found, value = batch.read(self._ref, "value")
+            if found:
+                return value
+
         # For a readonly ref, Python does not see its .value attribute so we
         # run the .value in JavaScript.
         from ipymuvue.pyodide.proxies import python_compatible
@@ -48,6 +56,13 @@ class ProxyRef:
 
     @value.setter
     def value(self, value):
+        from ipymuvue.pyodide.proxies.batching import pending
+
+        batch = pending()
+        if batch is not None:
+            batch.write(self._ref, "value", value)
+            return
+
         from ipymuvue.pyodide.proxies import vue_compatible
 
         self._ref.value = vue_compatible(value, reference=False)
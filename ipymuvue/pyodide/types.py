@@ -20,26 +20,30 @@ Type checks for objects coming out of the Vue.js API.
 
 # The interface to JavaScript, only available when running in pyodide.
 import js
+import pyodide
+
+# Load Vue from ipymuvue_js.ts implemented in TypeScript
+from ipymuvue_js import Vue
+
+# These checks run for most values crossing between Python and Vue, so we
+# resolve them once instead of looking them up on every call.
+_JsProxy = pyodide.ffi.JsProxy
+_isProxy = Vue.isProxy
+_isRef = Vue.isRef
 
 
 def is_vue_proxy(x):
     r"""
     Return whether ``x`` is a un unwrapped reactive Vue Proxy.
     """
-    import pyodide
-    from ipymuvue_js import Vue
-
-    return isinstance(x, pyodide.ffi.JsProxy) and Vue.isProxy(x)
+    return isinstance(x, _JsProxy) and _isProxy(x)
 
 
 def is_vue_ref(x):
     r"""
     Return whether ``x`` is a un unwrapped reactive Vue Ref.
     """
-    import pyodide
-    from ipymuvue_js import Vue
-
-    return isinstance(x, pyodide.ffi.JsProxy) and Vue.isRef(x)
+    return isinstance(x, _JsProxy) and _isRef(x)
 
 
 # Types for Runtime Type Checks of props
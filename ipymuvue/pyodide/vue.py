@@ -71,6 +71,7 @@ from ipymuvue.pyodide.types import (
 )
 from ipymuvue.pyodide.types import is_vue_ref, is_vue_proxy
 from ipymuvue.pyodide.proxies import vue_compatible, python_compatible
+from ipymuvue.pyodide.proxies.batching import batch
 
 # Load Vue from ipymuvue_js.ts implemented in TypeScript
 from ipymuvue_js import Vue
@@ -101,7 +102,7 @@ def define_component(
         if setup is not None:
             if not callable(setup):
                 raise TypeError("setup must be a function")
-            component.setup = prepare_setup(setup)
+            component.setup = prepare_setup(setup, name=name)
 
         if template is not None:
             if not isinstance(template, str):
@@ -132,10 +133,18 @@ def define_component(
     return component
 
 
-def prepare_setup(setup):
+def prepare_setup(setup, name=None):
     r"""
     Wraps a setup function to make it compatible with the Vue API.
+
+    Functions returned by ``setup()`` that do not depend on the component
+    instance, e.g., functions defined on the module level, are only proxied
+    once and shared by all instances of the component.
+
+    The proxies created during ``setup()`` are attributed to the component
+    ``name``, see :meth:`ipymuvue.pyodide.proxies.proxy_statistics`.
     """
+    component = name or f"{setup.__module__}.{setup.__qualname__}"
 
     from ipymuvue.pyodide.proxies import create_proxy
 
@@ -145,9 +154,9 @@ def prepare_setup(setup):
 
         js_exports = js.Object.new()
 
-        from ipymuvue.pyodide.proxies import owner
+        from ipymuvue.pyodide.proxies import owner, scope, shareable, shared
 
-        with owner(js_exports):
+        with owner(js_exports), scope(component) as proxies:
             assert is_vue_proxy(props)
 
             # The props are a Vue proxy. Wrap it so that it behaves like a Python
@@ -167,7 +176,10 @@ def prepare_setup(setup):
                     continue
 
                 try:
-                    export = vue_compatible(exports[name])
+                    if shareable(exports[name]):
+                        export = shared(exports[name])
+                    else:
+                        export = vue_compatible(exports[name])
                 except Exception:
                     raise TypeError(
                         f"could not convert {name} returned by setup() to be used in the component template"
@@ -175,6 +187,34 @@ def prepare_setup(setup):
 
                 setattr(js_exports, name, export)
 
+        # Release the proxies created during setup() as soon as the component
+        # has been unmounted instead of waiting for the JavaScript garbage
+        # collector to collect js_exports.
+        from ipymuvue.pyodide.proxies import (
+            release_proxy,
+            debugging_proxies,
+            report_proxies,
+        )
+
+        def release():
+            for key in proxies:
+                release_proxy(key)
+
+            # Report proxies owned by this component that were created
+            # outside of setup() and are therefore not released here.
+            if debugging_proxies():
+                report_proxies(js_exports, component, exclude=hook)
+
+            # The proxy of this hook cannot be destroyed while it is running.
+            import js
+            from ipymuvue.pyodide.proxies.conversion import release_proxy_js
+
+            for key in hook:
+                js.setTimeout(release_proxy_js, 0, key)
+
+        with owner(js_exports), scope(component) as hook:
+            on_unmounted(release)
+
         return js_exports
 
     # Vue checks the arity of the setup function to decide whether to call with
@@ -287,18 +327,10 @@ def watch(watched, on_change):
 
         @create_proxy
         def _watched():
-            reactive = vue_compatible(watched(), shallow=True)
-            if not is_vue_ref(reactive) and not is_vue_proxy(reactive):
-                raise TypeError(
-                    "watched object must be Vue Ref or a reactive Vue Proxy"
-                )
-            return reactive
+            return _watchable(watched())
 
     else:
-        watched = vue_compatible(watched, shallow=True)
-        if not is_vue_ref(watched) and not is_vue_proxy(watched):
-            raise TypeError("watched object must be Vue Ref or a reactive Vue Proxy")
-        _watched = watched
+        _watched = _watchable(watched)
 
     from ipymuvue.pyodide.proxies import create_proxy
 
@@ -309,7 +341,31 @@ def watch(watched, on_change):
     return Vue.watch(_watched, _on_change)
 
 
-def computed(getter):
+def _watchable(x):
+    r"""
+    Return ``x`` as a Vue Ref or a reactive Vue Proxy that can be passed to
+    Vue's ``watch``.
+    """
+    from ipymuvue.pyodide.proxies.proxy_ref import ProxyRef
+    from ipymuvue.pyodide.proxies.object_wrapper import ProxyDict
+    from ipymuvue.pyodide.proxies.array_wrapper import ProxyList
+
+    # Wrappers of reactive objects have been checked when they were created,
+    # so we do not need to ask Vue again.
+    if type(x) is ProxyRef:
+        return x._ref
+    if type(x) is ProxyDict:
+        return x._object
+    if type(x) is ProxyList:
+        return x._array
+
+    x = vue_compatible(x, shallow=True)
+    if not is_vue_ref(x) and not is_vue_proxy(x):
+        raise TypeError("watched object must be Vue Ref or a reactive Vue Proxy")
+    return x
+
+
+def computed(getter, memo=False):
     r"""
     Return a readonly Vue Ref that contains the value produced by ``getter``.
 
@@ -317,17 +373,132 @@ def computed(getter):
     ``as_vue_compatible`` since Vue is going to install its reactivity hooks
     into it. If returning a list or a dict, use ``to_vue_compatible``
     explicitly inside the getter to make the value compatible.
+
+    INPUT:
+
+    - ``getter`` -- a callable without arguments
+
+    - ``memo`` -- a boolean (default: ``False``); whether to skip the
+      conversion of the value produced by ``getter`` if it is the same or
+      equal to the value it produced previously. The previous value is then
+      reused and watchers of this computed value are not triggered. Only use
+      this if ``getter`` does not modify and return the same object.
     """
 
     from ipymuvue.pyodide.proxies import create_proxy
 
-    @create_proxy
-    def _getter():
-        return vue_compatible(getter(), reference=None)
+    if not memo:
+
+        @create_proxy
+        def _getter():
+            return vue_compatible(getter(), reference=None)
+
+    else:
+        cache = []
+
+        @create_proxy
+        def _getter():
+            value = getter()
+
+            if cache and _unchanged(cache[0], value):
+                return cache[1]
+
+            cache[:] = [value, vue_compatible(value, reference=None)]
+            return cache[1]
 
     return python_compatible(Vue.computed(_getter))
 
 
+def _unchanged(previous, value):
+    r"""
+    Return whether ``value`` is identical or equal to ``previous``.
+
+    Values of different types are never considered equal, e.g., ``True`` and
+    ``1`` render differently in a template.
+    """
+    if previous is value:
+        return True
+
+    if type(previous) is not type(value):
+        return False
+
+    try:
+        # Some objects such as NumPy arrays do not return a bool here, we
+        # consider them as changed.
+        return (previous == value) is True
+    except Exception:
+        return False
+
+
+def animate(target, goal, duration=0.5, easing="ease-in-out"):
+    r"""
+    Animate the numbers in ``target`` towards the numbers in ``goal``.
+
+    The animation runs entirely in JavaScript, so animating many numbers,
+    e.g., the positions of thousands of vertices, only needs this single
+    call from Python. Any previous animation of ``target`` is stopped.
+
+    Returns an awaitable that completes when the animation ends.
+
+    INPUT:
+
+    - ``target`` -- a ref or a reactive dict or list
+
+    - ``goal`` -- a value with the same structure as ``target``; numbers in
+      ``goal`` are interpolated, other values are set immediately
+
+    - ``duration`` -- a number (default: ``0.5``); the length of the
+      animation in seconds
+
+    - ``easing`` -- one of ``"linear"``, ``"ease-in"``, ``"ease-out"``,
+      ``"ease-in-out"`` (default: ``"ease-in-out"``)
+
+    EXAMPLES:
+
+    Move all the vertices of a graph to new positions::
+
+        positions = ref({"a": [0, 0], "b": [10, 10]})
+        animate(positions, {"a": [100, 100], "b": [0, 100]})
+
+    """
+    # Load helper implemented in TypeScript in ipymuvue_js.ts
+    from ipymuvue_js import animate
+
+    return animate(
+        vue_compatible(target, shallow=True),
+        vue_compatible(goal, reference=False),
+        duration,
+        easing,
+    )
+
+
+def event_fields(*fields):
+    r"""
+    Decorate an event handler so that it only receives the ``fields`` of the
+    event it is called with.
+
+    The fields are read from the event in JavaScript, so no wrapper of the
+    full event object needs to be created in Python. This is much faster for
+    handlers that are called very frequently such as handlers of
+    ``mousemove``::
+
+        @event_fields("offsetX", "offsetY")
+        def drag(event):
+            position.value = [event.offsetX, event.offsetY]
+
+    Any further arguments are passed to the handler unchanged.
+    """
+    for field in fields:
+        if not isinstance(field, str):
+            raise TypeError("fields must be strings")
+
+    def decorator(handler):
+        handler._event_fields = fields
+        return handler
+
+    return decorator
+
+
 def on_mounted(callback):
     r"""
     Register ``callback`` to be called after the component has been mounted.
@@ -394,6 +565,9 @@ __all__ = [
     "reactive",
     "watch",
     "computed",
+    "batch",
+    "animate",
+    "event_fields",
     "on_mounted",
     "on_updated",
     "on_unmounted",
@@ -0,0 +1,105 @@
+r"""
+Runs Python functions of components in a Web Worker.
+
+The worker runs a separate Python interpreter that is started on demand and
+provisioned with the same Python files as the component. Arguments and
+results are copied between the two interpreters.
+"""
+# ******************************************************************************
+# Copyright (c) 2022 Julian Rüth <julian.rueth@fsfe.org>
+#
+# ipymuvue is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ipymuvue is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ipymuvue. If not, see <https://www.gnu.org/licenses/>.
+# ******************************************************************************
+
+
+async def call(module, function, *args):
+    r"""
+    Return the result of calling ``function`` of the Python ``module`` with
+    ``args`` in a Web Worker.
+
+    The worker runs a separate Python interpreter, so CPU heavy computations
+    do not block the browser while they run. The worker shares no state with
+    the interpreter running the components; the ``args`` and the result are
+    copied between the two and must therefore consist of lists, dicts,
+    primitive values, and numeric buffers such as NumPy arrays. Wrapped
+    reactive Vue objects such as ``props`` or refs are copied as a
+    :meth:`snapshot`.
+
+    The ``module`` must be one of the Python files provisioned for the
+    widget, e.g., a file that has been passed in the ``assets`` of a
+    ``VueWidget``.
+
+    EXAMPLES:
+
+    A component that lays out a graph in a worker::
+
+        import asyncio
+        from ipymuvue.pyodide.vue import ref, on_mounted
+        from ipymuvue.pyodide.worker import call
+
+        def setup(props, context):
+            positions = ref([])
+
+            async def layout():
+                positions.value = await call("layout", "spring", props.edges)
+
+            on_mounted(lambda: asyncio.ensure_future(layout()))
+
+            return {"positions": positions}
+
+    """
+    import js
+    import pyodide
+
+    # Load helper implemented in TypeScript in PythonWorker.ts
+    from ipymuvue_worker import call
+
+    result = await call(
+        module,
+        function,
+        pyodide.ffi.to_js(
+            _transferable(list(args)),
+            dict_converter=js.Object.fromEntries,
+            create_pyproxies=False,
+        ),
+    )
+
+    if isinstance(result, pyodide.ffi.JsProxy):
+        return result.to_py()
+
+    return result
+
+
+def _transferable(x):
+    r"""
+    Return ``x`` with all wrapped JavaScript objects and refs replaced by a
+    copy of their content as Python lists and dicts.
+    """
+    from ipymuvue.pyodide.proxies.array_wrapper import ArrayWrapper
+    from ipymuvue.pyodide.proxies.object_wrapper import ObjectWrapper
+    from ipymuvue.pyodide.proxies.proxy_ref import ProxyRef
+
+    if isinstance(x, (ArrayWrapper, ObjectWrapper)):
+        return x.snapshot()
+
+    if isinstance(x, ProxyRef):
+        return _transferable(x.value)
+
+    if type(x) in [list, tuple]:
+        return [_transferable(item) for item in x]
+
+    if type(x) is dict:
+        return {key: _transferable(value) for (key, value) in x.items()}
+
+    return x
@@ -0,0 +1,147 @@
+r"""
+Serves a local copy of the pyodide distribution from the Jupyter server.
+
+By default, the frontend loads pyodide from a CDN. When this server extension
+is enabled and a copy of pyodide has been downloaded with::
+
+    python -m ipymuvue.server
+
+the frontend loads pyodide from the Jupyter server instead.
+
+The copy is looked up in the directory given by the environment variable
+``IPYMUVUE_PYODIDE_PATH`` or in ``ipymuvue/pyodide/<version>`` in the Jupyter
+data directory.
+"""
+# ******************************************************************************
+# Copyright (c) 2022 Julian Rüth <julian.rueth@fsfe.org>
+#
+# ipymuvue is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ipymuvue is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ipymuvue. If not, see <https://www.gnu.org/licenses/>.
+# ******************************************************************************
+
+import os
+
+from tornado.web import StaticFileHandler
+
+# This version must match PYODIDE_VERSION in ts/src/PythonInterpreter.ts
+PYODIDE_VERSION = "0.21.0a3"
+
+PYODIDE_CDN = f"https://cdn.jsdelivr.net/pyodide/v{PYODIDE_VERSION}/full"
+
+# The files of the pyodide distribution that are needed to start the
+# interpreter. We do not load any additional packages.
+PYODIDE_FILES = [
+    "pyodide.js",
+    "pyodide.asm.js",
+    "pyodide.asm.wasm",
+    "pyodide.asm.data",
+    "pyodide_py.tar",
+    "repodata.json",
+]
+
+
+def pyodide_path():
+    r"""
+    Return the directory containing the local copy of pyodide.
+
+    EXAMPLES:
+
+    Unless ``IPYMUVUE_PYODIDE_PATH`` is set, the directory is specific to the
+    version of pyodide::
+
+        >>> import os.path
+        >>> from ipymuvue.server import pyodide_path, PYODIDE_VERSION
+        >>> os.path.basename(pyodide_path()) == PYODIDE_VERSION
+        True
+
+    """
+    if "IPYMUVUE_PYODIDE_PATH" in os.environ:
+        return os.environ["IPYMUVUE_PYODIDE_PATH"]
+
+    from jupyter_core.paths import jupyter_data_dir
+
+    return os.path.join(jupyter_data_dir(), "ipymuvue", "pyodide", PYODIDE_VERSION)
+
+
+def download_pyodide(path=None, url=PYODIDE_CDN):
+    r"""
+    Download the pyodide distribution from ``url`` to ``path`` (defaults to
+    :func:`pyodide_path`) so it can be served by the Jupyter server.
+    """
+    from urllib.request import urlopen
+    import shutil
+
+    path = path or pyodide_path()
+
+    os.makedirs(path, exist_ok=True)
+
+    for fname in PYODIDE_FILES:
+        target = os.path.join(path, fname)
+
+        if os.path.exists(target):
+            continue
+
+        with urlopen(f"{url}/{fname}") as response:
+            with open(f"{target}.part", "wb") as download:
+                shutil.copyfileobj(response, download)
+
+        os.replace(f"{target}.part", target)
+
+    return path
+
+
+class PyodideHandler(StaticFileHandler):
+    r"""
+    Serves the files of the pyodide distribution.
+
+    The URLs of these files contain the pyodide version, so browsers can cache
+    them indefinitely.
+    """
+
+    def set_extra_headers(self, path):
+        self.set_header("Cache-Control", "public, max-age=31536000, immutable")
+
+    def get_content_type(self):
+        # Browsers only compile WebAssembly while streaming it if it is served
+        # with the correct MIME type which is not known to all systems.
+        if self.absolute_path.endswith(".wasm"):
+            return "application/wasm"
+
+        return super().get_content_type()
+
+
+def _load_jupyter_server_extension(server_app):
+    r"""
+    Called by the Jupyter server to register the handler serving pyodide.
+    """
+    from jupyter_server.utils import url_path_join
+
+    path = pyodide_path()
+
+    if not os.path.isdir(path):
+        server_app.log.info(
+            f"ipymuvue will load pyodide from {PYODIDE_CDN} since there is no local copy in {path}; run `python -m ipymuvue.server` to download one"
+        )
+        return
+
+    web_app = server_app.web_app
+    route = url_path_join(
+        web_app.settings["base_url"], "ipymuvue", "pyodide", PYODIDE_VERSION, "(.*)"
+    )
+    web_app.add_handlers(".*$", [(route, PyodideHandler, {"path": path})])
+
+    server_app.log.info(f"ipymuvue serves pyodide from {path}")
+
+
+if __name__ == "__main__":
+    print(f"Downloaded pyodide to {download_pyodide()}")
@@ -16,3 +16,5 @@
 # ******************************************************************************
 
 from ipymuvue.widgets.vue_widget import VueWidget
+from ipymuvue.widgets.virtual import VirtualList
+from ipymuvue.widgets.streaming import Stream
@@ -0,0 +1,198 @@
+r"""
+Binary buffers in messages between the kernel and the frontend.
+
+Messages on the comm are JSON, but they can come with a list of binary
+buffers. Here we replace binary data in messages with placeholders that
+refer to such buffers, so that binary data is not serialized as JSON.
+
+In the frontend, the same happens to ArrayBuffers, DataViews and typed arrays
+such as Float64Array, see ``Buffers.ts``.
+"""
+# ******************************************************************************
+# Copyright (c) 2022 Julian Rüth <julian.rueth@fsfe.org>
+#
+# ipymuvue is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ipymuvue is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ipymuvue. If not, see <https://www.gnu.org/licenses/>.
+# ******************************************************************************
+
+# The key that marks a placeholder for a buffer in a message.
+PLACEHOLDER = "__ipymuvue_buffer__"
+
+# Maps the typed arrays of JavaScript to the corresponding struct format
+# characters in Python.
+FORMATS = {
+    "ArrayBuffer": "B",
+    "DataView": "B",
+    "Int8Array": "b",
+    "Uint8Array": "B",
+    "Uint8ClampedArray": "B",
+    "Int16Array": "h",
+    "Uint16Array": "H",
+    "Int32Array": "i",
+    "Uint32Array": "I",
+    "Float32Array": "f",
+    "Float64Array": "d",
+    "BigInt64Array": "q",
+    "BigUint64Array": "Q",
+}
+
+
+def typed_array(format):
+    r"""
+    Return the name of the JavaScript typed array that corresponds to the
+    struct ``format``.
+
+    EXAMPLES::
+
+        >>> typed_array("d")
+        'Float64Array'
+        >>> typed_array("<l") in ["Int32Array", "BigInt64Array"]
+        True
+
+    """
+    import struct
+
+    format = format.lstrip("@=<>!")
+
+    if format in ["f", "d"]:
+        return {4: "Float32Array", 8: "Float64Array"}[struct.calcsize(format)]
+
+    if format in "bhilqn":
+        return {1: "Int8Array", 2: "Int16Array", 4: "Int32Array", 8: "BigInt64Array"}[
+            struct.calcsize(format)
+        ]
+
+    if format in "BHILQN":
+        return {
+            1: "Uint8Array",
+            2: "Uint16Array",
+            4: "Uint32Array",
+            8: "BigUint64Array",
+        }[struct.calcsize(format)]
+
+    return "Uint8Array"
+
+
+def extract_buffers(value, buffers=None):
+    r"""
+    Return a copy of ``value`` where binary data has been replaced with
+    placeholders and the list of buffers these placeholders refer to.
+
+    Binary data is anything that is ``bytes``, ``bytearray``, a
+    ``memoryview``, or a NumPy array.
+
+    EXAMPLES::
+
+        >>> message, buffers = extract_buffers({"pixels": bytes([1, 2, 3]), "width": 3})
+        >>> message
+        {'pixels': {'__ipymuvue_buffer__': 0, 'type': 'Uint8Array'}, 'width': 3}
+        >>> buffers[0].tobytes()
+        b'\x01\x02\x03'
+
+    Buffers are sent in little-endian byte order since this is the byte order
+    of typed arrays in browsers::
+
+        >>> import ctypes
+        >>> big_endian = (ctypes.c_double.__ctype_be__ * 2)(1, 2)
+        >>> message, buffers = extract_buffers(memoryview(big_endian))
+        >>> message
+        {'__ipymuvue_buffer__': 0, 'type': 'Float64Array'}
+        >>> buffers[0].tobytes() == memoryview((ctypes.c_double.__ctype_le__ * 2)(1, 2)).tobytes()
+        True
+
+    """
+    if buffers is None:
+        buffers = []
+
+    if isinstance(value, (bytes, bytearray, memoryview)) or hasattr(
+        value, "__array_interface__"
+    ):
+        view = _little_endian(memoryview(value))
+
+        buffers.append(view)
+        return {PLACEHOLDER: len(buffers) - 1, "type": typed_array(view.format)}, buffers
+
+    if isinstance(value, dict):
+        return {
+            key: extract_buffers(item, buffers)[0] for (key, item) in value.items()
+        }, buffers
+
+    if isinstance(value, (list, tuple)):
+        return [extract_buffers(item, buffers)[0] for item in value], buffers
+
+    return value, buffers
+
+
+def _little_endian(view):
+    r"""
+    Return the data of the memoryview ``view`` as a contiguous memoryview in
+    little-endian byte order.
+
+    Data that is not made up of a single kind of number is returned as bytes.
+    """
+    import sys
+
+    format = view.format.lstrip("@=<>!")
+
+    if len(format) != 1 or format not in "?bBhHiIlLqQnNfd":
+        return memoryview(view.tobytes())
+
+    order = view.format[0] if view.format[0] in "@=<>!" else "@"
+    big_endian = order in ">!" or (order in "@=" and sys.byteorder == "big")
+
+    if big_endian and view.itemsize > 1:
+        import array
+
+        swapped = array.array({2: "H", 4: "I", 8: "Q"}[view.itemsize])
+        swapped.frombytes(view.tobytes())
+        swapped.byteswap()
+        return memoryview(swapped.tobytes()).cast(format)
+
+    if not view.c_contiguous:
+        return memoryview(view.tobytes()).cast(format)
+
+    return view
+
+
+def restore_buffers(value, buffers):
+    r"""
+    Return a copy of ``value`` where the placeholders referring to
+    ``buffers`` have been replaced with ``memoryview`` objects of the
+    corresponding buffers.
+
+    The memoryviews use the format of the typed array they were created
+    from in the frontend, so they can be turned into NumPy arrays without
+    copying with ``numpy.asarray()``.
+
+    EXAMPLES::
+
+        >>> import array
+        >>> message = restore_buffers({"x": {"__ipymuvue_buffer__": 0, "type": "Float64Array"}}, [array.array("d", [1, 2]).tobytes()])
+        >>> message["x"].tolist()
+        [1.0, 2.0]
+
+    """
+    if not buffers:
+        return value
+
+    if isinstance(value, dict):
+        if PLACEHOLDER in value:
+            view = memoryview(buffers[value[PLACEHOLDER]]).cast("B")
+            return view.cast(FORMATS.get(value.get("type"), "B"))
+
+        return {key: restore_buffers(item, buffers) for (key, item) in value.items()}
+
+    if isinstance(value, list):
+        return [restore_buffers(item, buffers) for item in value]
+
+    return value
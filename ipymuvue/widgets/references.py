@@ -160,12 +160,16 @@ class Subcomponent:
 
         result = asyncio.get_running_loop().create_future()
 
-        def on_msg(_, content, __):
+        from ipymuvue.widgets.buffers import extract_buffers, restore_buffers
+
+        def on_msg(_, content, buffers):
             try:
                 if content.get("identifier", None) == identifier:
                     assert return_when != "IGNORE"
                     assert "results" in content
 
+                    content = restore_buffers(content, buffers)
+
                     Subcomponent._set_result(
                         result,
                         content["results"],
@@ -178,6 +182,8 @@ class Subcomponent:
                 result.cancel()
                 raise
 
+        args, buffers = extract_buffers(args)
+
         with widget._on_msg(on_msg):
             widget.send(
                 dict(
@@ -187,7 +193,8 @@ class Subcomponent:
                     args=args,
                     return_when=return_when,
                     views=views,
-                )
+                ),
+                buffers=buffers,
             )
 
             if return_when == "IGNORE":
@@ -253,6 +260,11 @@ class SubcomponentMethod:
         Returns a list of futures otherwise. These futures resolve to a value,
         an exception or a pair ``(value, identifier)`` as above.
 
+        Binary data such as ``bytes``, ``memoryview`` or NumPy arrays in the
+        arguments are sent as binary buffers and arrive as typed arrays in
+        the frontend. Typed arrays in the results are returned as a
+        ``memoryview``.
+
         """
         return await self._subcomponent._invoke(
             path=[],
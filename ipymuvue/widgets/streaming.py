@@ -0,0 +1,181 @@
+r"""
+Streaming rows of tables to the frontend.
+"""
+# ******************************************************************************
+# Copyright (c) 2022 Julian Rüth <julian.rueth@fsfe.org>
+#
+# ipymuvue is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ipymuvue is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ipymuvue. If not, see <https://www.gnu.org/licenses/>.
+# ******************************************************************************
+
+import collections
+from traitlets import TraitType
+
+
+class Stream(TraitType):
+    r"""
+    An append-only list traitlet that holds at most ``maxlen`` rows.
+
+    Rows are added with :meth:`VueWidget.stream` which only sends the new rows
+    to the frontend. The frontend appends them to the list in the Vue ``data``
+    and drops the oldest rows when there are more than ``maxlen``::
+
+        class Widget(VueWidget):
+            def __init__(self):
+                super().__init__(template=r'''
+                    <table>
+                        <tr v-for="tick of ticks"><td>{{ tick.time }}</td><td>{{ tick.price }}</td></tr>
+                    </table>
+                ''')
+
+            ticks = Stream(maxlen=100).tag(sync=True)
+
+        widget = Widget()
+        widget.stream("ticks", [{"time": 0, "price": 1.0}, {"time": 1, "price": 1.1}])
+
+    Assigning to this traitlet replaces all rows and sends them to the
+    frontend.
+    """
+
+    info_text = "an iterable of rows"
+
+    def __init__(self, maxlen=None, **kwargs):
+        if maxlen is not None and maxlen <= 0:
+            raise ValueError("maxlen must be positive")
+
+        self.maxlen = maxlen
+
+        super().__init__(**kwargs)
+
+        self.tag(to_json=self._to_json, from_json=self._from_json)
+
+    def make_dynamic_default(self):
+        return collections.deque(maxlen=self.maxlen)
+
+    def validate(self, obj, value):
+        try:
+            return collections.deque(value, maxlen=self.maxlen)
+        except TypeError:
+            self.error(obj, value)
+
+    def _to_json(self, value, widget):
+        return list(value)
+
+    def _from_json(self, value, widget):
+        r"""
+        Return the value of this traitlet on ``widget``.
+
+        Streams only flow from the kernel to the frontend, so we ignore
+        ``value``.
+        """
+        return getattr(widget, self.name)
+
+
+def records_and_columns(rows):
+    r"""
+    Return ``rows`` as a pair of a list of records and a dict of columns.
+
+    The ``rows`` can be a list of dicts, a dict of lists, a list of scalars,
+    or a pandas DataFrame.
+
+    If ``rows`` is a list of scalars, the columns are a dict with the single
+    key ``None``.
+
+    EXAMPLES::
+
+        >>> records_and_columns([{"x": 1, "y": 2}, {"x": 3, "y": 4}])
+        ([{'x': 1, 'y': 2}, {'x': 3, 'y': 4}], {'x': [1, 3], 'y': [2, 4]})
+        >>> records_and_columns({"x": [1, 3], "y": [2, 4]})
+        ([{'x': 1, 'y': 2}, {'x': 3, 'y': 4}], {'x': [1, 3], 'y': [2, 4]})
+        >>> records_and_columns([1, 2])
+        ([1, 2], {None: [1, 2]})
+
+    """
+    from collections.abc import Mapping
+
+    if hasattr(rows, "to_dict") and not isinstance(rows, Mapping):
+        # A pandas DataFrame
+        return rows.to_dict(orient="records"), rows.to_dict(orient="list")
+
+    if isinstance(rows, Mapping):
+        columns = {key: list(values) for (key, values) in rows.items()}
+
+        if len(set(len(values) for values in columns.values())) > 1:
+            raise ValueError("all columns must have the same length")
+
+        records = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        return records, columns
+
+    records = list(rows)
+
+    if not records or not isinstance(records[0], Mapping):
+        return records, {None: records}
+
+    keys = list(records[0])
+    expected = set(keys)
+
+    for record in records:
+        if not isinstance(record, Mapping) or set(record) != expected:
+            raise ValueError("all rows must have the same keys")
+
+    return records, {key: [record[key] for record in records] for key in keys}
+
+
+def encode(columns):
+    r"""
+    Return a compact encoding of ``columns`` as a pair of a JSON header and a
+    list of binary buffers.
+
+    Columns that only contain numbers are sent as a binary buffer of float64
+    values. Other columns are sent as JSON.
+
+    EXAMPLES::
+
+        >>> header, buffers = encode({"x": [1, 2.5], "label": ["a", "b"]})
+        >>> header
+        {'length': 2, 'columns': [{'name': 'x', 'dtype': 'float64', 'buffer': 0}, {'name': 'label', 'values': ['a', 'b']}]}
+        >>> buffers[0].tolist()
+        [1.0, 2.5]
+
+    """
+    import array
+    import numbers
+    import sys
+
+    lengths = set(len(values) for values in columns.values())
+    if len(lengths) > 1:
+        raise ValueError("all columns must have the same length")
+
+    header = {"length": lengths.pop() if lengths else 0, "columns": []}
+    buffers = []
+
+    for (name, values) in columns.items():
+        if values and all(
+            isinstance(value, numbers.Real) and not isinstance(value, bool)
+            for value in values
+        ):
+            buffer = array.array("d", values)
+
+            # JavaScript's typed arrays use the platform's byte order which
+            # is little endian for all relevant platforms.
+            if sys.byteorder == "big":
+                buffer.byteswap()
+
+            header["columns"].append(
+                {"name": name, "dtype": "float64", "buffer": len(buffers)}
+            )
+            buffers.append(memoryview(buffer))
+        else:
+            header["columns"].append({"name": name, "values": list(values)})
+
+    return header, buffers
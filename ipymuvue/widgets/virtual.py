@@ -0,0 +1,101 @@
+r"""
+Collections that are only sent to the frontend on demand.
+"""
+# ******************************************************************************
+# Copyright (c) 2022 Julian Rüth <julian.rueth@fsfe.org>
+#
+# ipymuvue is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ipymuvue is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ipymuvue. If not, see <https://www.gnu.org/licenses/>.
+# ******************************************************************************
+
+import itertools
+from traitlets import TraitType
+
+
+class VirtualList(TraitType):
+    r"""
+    A list traitlet whose items are only sent to the frontend when they are
+    actually rendered.
+
+    Instead of the full list, the frontend only receives its length. The
+    ``<ipymuvue-virtual-list>`` component then requests the windows of the
+    list that are visible (and some items around them) from the kernel::
+
+        class Widget(VueWidget):
+            def __init__(self):
+                super().__init__(template=r'''
+                    <ipymuvue-virtual-list :source="rows" :item-height="24" :height="480" v-slot="{ item, index }">
+                        {{ index }}: {{ item }}
+                    </ipymuvue-virtual-list>
+                ''')
+
+            rows = VirtualList(range(10**6)).tag(sync=True)
+
+    The value of this traitlet can be anything that supports ``len()`` and
+    slicing, e.g., a list, a range, or a NumPy array.
+
+    Note that changes to the list in place are not noticed. Assign a new list
+    or call ``widget.send_state("rows")`` to update the frontend.
+    """
+
+    info_text = "a sequence supporting len() and slicing"
+
+    def __init__(self, default_value=(), **kwargs):
+        super().__init__(default_value=default_value, **kwargs)
+
+        # Every time the length is sent to the frontend, we attach a new
+        # version so that the frontend knows to drop the items it received
+        # previously.
+        self._versions = itertools.count()
+
+        self.tag(to_json=self._to_json, from_json=self._from_json)
+
+    def validate(self, obj, value):
+        if not hasattr(value, "__len__") or not hasattr(value, "__getitem__"):
+            self.error(obj, value)
+        return value
+
+    def _to_json(self, value, widget):
+        r"""
+        Return the state of ``value`` that is synchronized with the frontend.
+        """
+        return {
+            "name": self.name,
+            "length": len(value),
+            "version": next(self._versions),
+        }
+
+    def _from_json(self, value, widget):
+        r"""
+        Return the value of this traitlet on ``widget``.
+
+        The frontend cannot modify a virtual list, so we ignore ``value``.
+        """
+        return getattr(widget, self.name)
+
+    @staticmethod
+    def window(value, offset, limit):
+        r"""
+        Return the items ``offset`` to ``offset + limit`` of ``value`` as a
+        list that can be sent to the frontend.
+        """
+        if offset < 0 or limit < 0:
+            raise ValueError("offset and limit must be non-negative")
+
+        items = value[offset : offset + limit]
+
+        if hasattr(items, "tolist"):
+            # Convert NumPy arrays and similar to plain lists.
+            return items.tolist()
+
+        return list(items)
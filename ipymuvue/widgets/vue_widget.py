@@ -22,6 +22,48 @@ from ipymuvue.version import __version__ as version
 from traitlets import Unicode, List, Dict, Instance
 
 
+def _client_bundle():
+    r"""
+    Return the Python files of ipymuvue that are needed in the frontend,
+    indexed by their path relative to the directory containing the ipymuvue
+    package.
+
+    The files under ``widgets/`` are not needed since they import ipywidgets
+    which is not available in pyodide.
+
+    EXAMPLES::
+
+        >>> from ipymuvue.widgets.vue_widget import CLIENT_BUNDLE
+        >>> "ipymuvue/pyodide/vue.py" in CLIENT_BUNDLE
+        True
+        >>> "ipymuvue/widgets/vue_widget.py" in CLIENT_BUNDLE
+        False
+
+    """
+    import glob
+    import os.path
+
+    package = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    fnames = [
+        os.path.join(package, fname)
+        for fname in ["__init__.py", "version.py", "special.py"]
+    ] + glob.glob(os.path.join(package, "pyodide", "**", "*.py"), recursive=True)
+
+    bundle = {}
+    for fname in sorted(fnames):
+        with open(fname, "rb") as source:
+            name = os.path.relpath(fname, start=os.path.dirname(package))
+            bundle[name.replace(os.path.sep, "/")] = source.read()
+
+    return bundle
+
+
+# The Python files shipped with every widget; computed once so that creating
+# a widget does not need to read them again.
+CLIENT_BUNDLE = _client_bundle()
+
+
 class VueWidget(DOMWidget):
     r"""
     A reactive widget.
@@ -54,6 +96,17 @@ class VueWidget(DOMWidget):
         self.__template = template
         self.__type = type(self).__name__
 
+        # Where the frontend loads pyodide from; if not set, the frontend uses
+        # the copy served by the Jupyter server (see ipymuvue.server) or
+        # falls back to a CDN.
+        import os
+
+        self.__pyodide = os.environ.get("IPYMUVUE_PYODIDE_URL", "")
+
+        # Where the frontend loads https:// imports of components from; if
+        # not set, they are loaded from their original location.
+        self.__mirror = os.environ.get("IPYMUVUE_REMOTE_MIRROR", "")
+
         self._initialize_components(components, assets)
         self._initialize_assets(assets)
 
@@ -160,24 +213,13 @@ class VueWidget(DOMWidget):
         r"""
         Prepare virtual file system for assets.
         """
-        import os.path
-        import glob
-
-        # Ship ipymuvue to the client (they probably only need the things that are in pyodide/
-        for fname in glob.glob(
-            os.path.join(os.path.dirname(os.path.dirname(__file__)), "**/*.py"),
-            recursive=True,
-        ):
+        # Ship the parts of ipymuvue to the client that run in pyodide.
+        for (fname, content) in CLIENT_BUNDLE.items():
             if fname in assets:
                 raise ValueError(
                     f"assets must not contain {fname} as it is shipped with ipymuvue"
                 )
-            assets[
-                os.path.relpath(
-                    fname,
-                    start=os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-                )
-            ] = open(fname, "rb").read()
+            assets[fname] = content
 
         for (fname, content) in assets.items():
             if not isinstance(fname, str):
@@ -229,6 +271,54 @@ class VueWidget(DOMWidget):
 
         return super()._repr_mimebundle_(**kwargs)
 
+    def stream(self, name, rows):
+        r"""
+        Append ``rows`` to the :class:`Stream` traitlet ``name``.
+
+        Only the new ``rows`` are sent to the frontend. Numeric columns are
+        sent in a compact binary format.
+
+        The ``rows`` can be a list of dicts, a dict of lists, a list of
+        scalars, or a pandas DataFrame.
+        """
+        from ipymuvue.widgets.streaming import Stream, records_and_columns, encode
+
+        trait = self.traits().get(name, None)
+
+        if not isinstance(trait, Stream):
+            raise ValueError(f"{name} is not a Stream traitlet")
+
+        records, columns = records_and_columns(rows)
+
+        if not records:
+            return
+
+        getattr(self, name).extend(records)
+
+        chunk, buffers = encode(columns)
+        chunk["scalar"] = None in columns
+
+        self.send(dict(stream=name, maxlen=trait.maxlen, chunk=chunk), buffers=buffers)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        r"""
+        Coalesce all changes to traitlets made during this context into a
+        single update of the frontend.
+
+        The frontend applies all these changes at once, so Vue only rerenders
+        once when the transaction is committed::
+
+            with widget.transaction():
+                widget.vertices = vertices
+                widget.edges = edges
+
+        Transactions can be nested; changes are sent when the outermost
+        transaction ends.
+        """
+        with self.hold_sync():
+            yield self
+
     @contextlib.contextmanager
     def _on_msg(self, handler):
         r"""
@@ -254,22 +344,64 @@ class VueWidget(DOMWidget):
             self.on_msg(logging_handler)
             return logging_handler
 
-    def _handle_message(self, _, content, __):
+    def _handle_message(self, _, content, buffers):
         r"""
         Handle a message coming in on the comm from the frontend model.
         """
+        from ipymuvue.widgets.buffers import restore_buffers
+
+        content = restore_buffers(content, buffers)
+
         if "method" in content:
             with (self.__output or contextlib.nullcontext()):
                 self._handle_callback(**content)
                 return
 
+        if "window" in content:
+            with (self.__output or contextlib.nullcontext()):
+                self._handle_window(**content)
+                return
+
     def _handle_callback(self, method, args=()):
         r"""
         Call the method called ``method`` that has been marked as ``callback``
         with ``args``.
+
+        Binary data such as typed arrays in ``args`` is received as a
+        ``memoryview``.
         """
         getattr(self, method)(*args)
 
+    def _handle_window(self, window, identifier, offset, limit):
+        r"""
+        Send the items ``offset`` to ``offset + limit`` of the
+        :class:`VirtualList` called ``window`` to the frontend.
+
+        If the items cannot be determined, the error is sent to the frontend
+        so it does not wait for the items forever.
+        """
+        from ipymuvue.widgets.virtual import VirtualList
+
+        try:
+            trait = self.traits().get(window, None)
+
+            if not isinstance(trait, VirtualList):
+                raise ValueError(f"{window} is not a VirtualList traitlet")
+
+            value = getattr(self, window)
+
+            reply = dict(
+                identifier=identifier,
+                offset=offset,
+                items=VirtualList.window(value, offset, limit),
+                length=len(value),
+            )
+        except Exception as e:
+            self.send(dict(identifier=identifier, error=str(e)))
+            raise
+
+        self.send(reply)
+
     @staticmethod
     def callback(method):
         r"""
@@ -290,6 +422,8 @@ class VueWidget(DOMWidget):
     __methods = List([]).tag(sync=True)
     __components = Dict().tag(sync=True)
     __assets = Dict().tag(sync=True)
+    __pyodide = Unicode("").tag(sync=True)
+    __mirror = Unicode("").tag(sync=True)
     __children = Dict(Instance(DOMWidget), key_trait=Unicode()).tag(
         sync=True, **widget_serialization
     )
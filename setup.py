@@ -37,6 +37,7 @@ data_files_spec = [
     ('share/jupyter/labextensions/ipymuvue', 'ipymuvue/labextension', "**"),
     ("share/jupyter/labextensions/ipymuvue", '.', "install.json"),
     ('etc/jupyter/nbconfig/notebook.d', '.', 'ipymuvue.json'),
+    ('etc/jupyter/jupyter_server_config.d', 'jupyter-config/jupyter_server_config.d', 'ipymuvue.json'),
 ]
 
 cmdclass = create_cmdclass('jsdeps', data_files_spec=data_files_spec)
@@ -0,0 +1,125 @@
+/* ******************************************************************************
+ * Copyright (c) 2022 Julian Rüth <julian.rueth@fsfe.org>
+ *
+ * ipymuvue is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * ipymuvue is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with ipymuvue. If not, see <https://www.gnu.org/licenses/>.
+ * ******************************************************************************/
+
+import { isRef, toRaw } from "vue";
+
+/*
+ * Easing functions mapping the elapsed fraction of an animation to the
+ * fraction of the distance covered.
+ */
+const EASINGS: Record<string, (t: number) => number> = {
+  "linear": (t) => t,
+  "ease-in": (t) => t * t,
+  "ease-out": (t) => t * (2 - t),
+  "ease-in-out": (t) => t < .5 ? 2 * t * t : -1 + (4 - 2 * t) * t,
+};
+
+/*
+ * A number that is being animated, namely `parent[key]` goes from `from` to
+ * `to`.
+ */
+interface Leaf {
+  parent: any;
+  key: string | number;
+  from: number;
+  to: number;
+}
+
+/*
+ * The animations currently running indexed by their (raw) target.
+ */
+const running = new WeakMap<object, { frame: number, resolve: () => void }>();
+
+/*
+ * Collect the numbers in `goal` that need to be animated in `parent[key]`.
+ * Values that are not numbers or have no numeric counterpart in `parent` are
+ * set immediately.
+ */
+function collect(parent: any, key: string | number, goal: any, leaves: Leaf[]) {
+  const current = parent[key];
+
+  if (typeof goal === "number") {
+    if (typeof current === "number")
+      leaves.push({ parent, key, from: current, to: goal });
+    else
+      parent[key] = goal;
+    return;
+  }
+
+  if (goal !== null && typeof goal === "object" && current !== null && typeof current === "object" && Array.isArray(goal) === Array.isArray(current)) {
+    for (const child of Object.keys(goal))
+      collect(current, child, goal[child], leaves);
+    return;
+  }
+
+  parent[key] = goal;
+}
+
+/*
+ * Animate the numbers in `target` (a Vue ref or reactive object) towards the
+ * numbers in `goal` over `duration` seconds in a single
+ * `requestAnimationFrame` loop.
+ *
+ * Any previous animation of `target` is stopped. Returns a promise that
+ * resolves when the animation ends or is stopped.
+ */
+export function animate(target: any, goal: any, duration: number = .5, easing: string = "ease-in-out"): Promise<void> {
+  const ease = EASINGS[easing];
+  if (ease === undefined)
+    throw Error(`unknown easing ${easing}; must be one of ${Object.keys(EASINGS).join(", ")}`);
+
+  const raw = toRaw(target);
+
+  running.get(raw)?.resolve();
+
+  const leaves: Leaf[] = [];
+  if (isRef(target))
+    collect(target, "value", goal, leaves);
+  else
+    for (const key of Object.keys(goal))
+      collect(target, key, goal[key], leaves);
+
+  return new Promise((resolve) => {
+    const start = performance.now();
+
+    const animation = {
+      frame: 0,
+      resolve: () => {
+        cancelAnimationFrame(animation.frame);
+        if (running.get(raw) === animation)
+          running.delete(raw);
+        resolve();
+      },
+    };
+
+    const step = (now: number) => {
+      const t = duration > 0 ? Math.min(1, (now - start) / (duration * 1000)) : 1;
+      const e = ease(t);
+
+      for (const leaf of leaves)
+        leaf.parent[leaf.key] = t === 1 ? leaf.to : leaf.from + (leaf.to - leaf.from) * e;
+
+      if (t < 1)
+        animation.frame = requestAnimationFrame(step);
+      else
+        animation.resolve();
+    };
+
+    running.set(raw, animation);
+    animation.frame = requestAnimationFrame(step);
+  });
+}
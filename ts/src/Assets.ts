@@ -46,6 +46,12 @@ export class AssetProvisioner {
 
       this.FS.writeFile(name, new Uint8Array(content.buffer), { encoding: "binary" });
 
+      // Python only reuses compiled bytecode if the modification time of the
+      // source did not change, see BytecodeCache. So we derive the
+      // modification time from the content instead of using the current time.
+      const mtime = AssetProvisioner.hash(content.buffer) * 1000;
+      (this.FS as any).utime(name, mtime, mtime);
+
       return provisioned;
   }
 
@@ -60,6 +66,16 @@ export class AssetProvisioner {
       await this.FS.mkdir(name);
   }
 
+  /*
+   * Return the 32 bit FNV-1a hash of `data`.
+   */
+  private static hash(data: ArrayBuffer) {
+    let hash = 0x811c9dc5;
+    for (const byte of new Uint8Array(data))
+      hash = Math.imul(hash ^ byte, 0x01000193);
+    return hash >>> 0;
+  }
+
   private static equal(lhs: ArrayBuffer, rhs: ArrayBuffer) {
     if (lhs.byteLength !== rhs.byteLength)
       return false;
@@ -0,0 +1,122 @@
+/* ******************************************************************************
+ * Copyright (c) 2022 Julian Rüth <julian.rueth@fsfe.org>
+ *
+ * ipymuvue is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * ipymuvue is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with ipymuvue. If not, see <https://www.gnu.org/licenses/>.
+ * ******************************************************************************/
+
+/*
+ * Binary buffers in messages between the frontend and the kernel.
+ *
+ * Messages on the comm are JSON, but they can come with a list of binary
+ * buffers. Here we replace binary data in messages with placeholders that
+ * refer to such buffers, so that binary data is not serialized as JSON.
+ *
+ * In the kernel, the same happens in ipymuvue/widgets/buffers.py.
+ */
+
+// The key that marks a placeholder for a buffer in a message.
+const PLACEHOLDER = "__ipymuvue_buffer__";
+
+// The types of binary data that we send as buffers.
+const TYPES = {
+  ArrayBuffer,
+  DataView,
+  Int8Array,
+  Uint8Array,
+  Uint8ClampedArray,
+  Int16Array,
+  Uint16Array,
+  Int32Array,
+  Uint32Array,
+  Float32Array,
+  Float64Array,
+  BigInt64Array,
+  BigUint64Array,
+};
+
+type Placeholder = {
+  [PLACEHOLDER]: number,
+  type: keyof typeof TYPES,
+};
+
+/*
+ * Return whether `value` is a plain JavaScript object, i.e., not a class
+ * instance such as a DOM event.
+ */
+function isPlainObject(value: any): value is Record<string, any> {
+  if (value === null || typeof value !== "object")
+    return false;
+
+  const prototype = Object.getPrototypeOf(value);
+  return prototype === Object.prototype || prototype === null;
+}
+
+/*
+ * Return a copy of `value` where binary data has been replaced with
+ * placeholders and the buffers that these placeholders refer to.
+ */
+export function extractBuffers(value: any, buffers: ArrayBufferView[] = []): [any, ArrayBufferView[]] {
+  if (value instanceof ArrayBuffer || ArrayBuffer.isView(value)) {
+    const type = (value instanceof ArrayBuffer ? "ArrayBuffer" : value.constructor.name) as keyof typeof TYPES;
+
+    buffers.push(value instanceof ArrayBuffer ? new DataView(value) : value);
+
+    const placeholder: Placeholder = { [PLACEHOLDER]: buffers.length - 1, type: type in TYPES ? type : "Uint8Array" };
+    return [placeholder, buffers];
+  }
+
+  if (Array.isArray(value))
+    return [value.map((item) => extractBuffers(item, buffers)[0]), buffers];
+
+  if (isPlainObject(value))
+    return [Object.fromEntries(Object.entries(value).map(([key, item]) => [key, extractBuffers(item, buffers)[0]])), buffers];
+
+  return [value, buffers];
+}
+
+/*
+ * Return a copy of `value` where the placeholders referring to `buffers`
+ * have been replaced by the typed arrays they were created from.
+ */
+export function restoreBuffers(value: any, buffers?: DataView[]): any {
+  if (!buffers?.length)
+    return value;
+
+  if (Array.isArray(value))
+    return value.map((item) => restoreBuffers(item, buffers));
+
+  if (isPlainObject(value)) {
+    if (PLACEHOLDER in value) {
+      const view = buffers[value[PLACEHOLDER]];
+      const type = TYPES[value.type as keyof typeof TYPES] ?? Uint8Array;
+
+      if (type === DataView)
+        return view;
+      if (type === ArrayBuffer)
+        return view.buffer.slice(view.byteOffset, view.byteOffset + view.byteLength);
+
+      const Type = type as typeof Uint8Array;
+
+      // Typed arrays must be aligned to their element size. If the buffer is
+      // not aligned, we need to copy it.
+      if (view.byteOffset % Type.BYTES_PER_ELEMENT === 0)
+        return new Type(view.buffer, view.byteOffset, view.byteLength / Type.BYTES_PER_ELEMENT);
+      return new Type(view.buffer.slice(view.byteOffset, view.byteOffset + view.byteLength));
+    }
+
+    return Object.fromEntries(Object.entries(value).map(([key, item]) => [key, restoreBuffers(item, buffers)]));
+  }
+
+  return value;
+}
@@ -0,0 +1,145 @@
+/* ******************************************************************************
+ * Copyright (c) 2022 Julian Rüth <julian.rueth@fsfe.org>
+ *
+ * ipymuvue is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * ipymuvue is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with ipymuvue. If not, see <https://www.gnu.org/licenses/>.
+ * ******************************************************************************/
+
+import type { PyodideInterface } from "pyodide";
+
+type FS = PyodideInterface["FS"];
+
+/*
+ * Persists the bytecode that Python compiles for imported modules in the
+ * browser's IndexedDB so that imports are fast when the page is reloaded.
+ *
+ * Python only reuses the bytecode if the modification time of the source
+ * file did not change, so the AssetProvisioner sets the modification time of
+ * provisioned files from a hash of their content.
+ *
+ * The cache is keyed by `version`. When the version changes, e.g., because
+ * ipymuvue or pyodide have been upgraded, the old bytecode is discarded.
+ */
+export class BytecodeCache {
+  constructor(pyodide: PyodideInterface, version: string) {
+    this.pyodide = pyodide;
+    this.FS = pyodide.FS;
+    this.version = version;
+  }
+
+  private readonly pyodide;
+  private readonly FS: FS;
+  private readonly version;
+
+  // The mount point of the IndexedDB backed file system.
+  private static readonly root = "/ipymuvue-cache";
+
+  // A timer for the next pending persist() if any.
+  private persisting: ReturnType<typeof setTimeout> | null = null;
+
+  /*
+   * Restore the bytecode from the previous session and make Python write
+   * bytecode into the cache.
+   *
+   * Returns whether the cache could be mounted; if IndexedDB is not
+   * available, e.g., in a private browser window, Python runs without a
+   * bytecode cache.
+   */
+  public async mount(): Promise<boolean> {
+    const FS = this.FS as any;
+
+    if (FS.filesystems?.IDBFS == null)
+      return false;
+
+    try {
+      if (!FS.analyzePath(BytecodeCache.root).exists)
+        FS.mkdir(BytecodeCache.root);
+      FS.mount(FS.filesystems.IDBFS, {}, BytecodeCache.root);
+
+      await this.sync(true);
+    } catch (e) {
+      console.warn("cannot restore Python bytecode cache", e);
+      return false;
+    }
+
+    this.prune();
+
+    const prefix = `${BytecodeCache.root}/${this.version}`;
+    if (!FS.analyzePath(prefix).exists)
+      FS.mkdir(prefix);
+
+    const sys = this.pyodide.pyimport("sys");
+    sys.pycache_prefix = prefix;
+    sys.dont_write_bytecode = false;
+    sys.destroy();
+
+    return true;
+  }
+
+  /*
+   * Write the bytecode compiled so far to IndexedDB.
+   *
+   * Since this is called after every import, the actual write is delayed
+   * until no imports happened for a while.
+   */
+  public persist() {
+    if (this.persisting != null)
+      clearTimeout(this.persisting);
+
+    this.persisting = setTimeout(async () => {
+      this.persisting = null;
+      try {
+        await this.sync(false);
+      } catch (e) {
+        console.warn("cannot persist Python bytecode cache", e);
+      }
+    }, 1000);
+  }
+
+  /*
+   * Remove bytecode cached for other versions.
+   */
+  private prune() {
+    const FS = this.FS as any;
+
+    for (const entry of FS.readdir(BytecodeCache.root))
+      if (entry !== "." && entry !== ".." && entry !== this.version)
+        this.remove(`${BytecodeCache.root}/${entry}`);
+  }
+
+  /*
+   * Remove the file or directory `path` recursively.
+   */
+  private remove(path: string) {
+    const FS = this.FS as any;
+
+    if (FS.isDir(FS.stat(path).mode)) {
+      for (const entry of FS.readdir(path))
+        if (entry !== "." && entry !== "..")
+          this.remove(`${path}/${entry}`);
+      FS.rmdir(path);
+    } else {
+      FS.unlink(path);
+    }
+  }
+
+  /*
+   * Synchronize the cache with IndexedDB; if `populate` is set, read from
+   * IndexedDB, otherwise write to it.
+   */
+  private sync(populate: boolean) {
+    return new Promise<void>((resolve, reject) => {
+      (this.FS as any).syncfs(populate, (error: any) => error ? reject(error) : resolve());
+    });
+  }
+}
@@ -22,6 +22,7 @@ import mapValues from "lodash-es/mapValues";
 import pickBy from "lodash-es/pickBy";
 import type { ComponentPublicInstance } from "vue";
 import isPromise from "is-promise";
+import { extractBuffers } from "./Buffers";
 
 /*
  * A message sent by the Python backend to tell us to invoke `target` on `path`
@@ -160,12 +161,12 @@ export class Handler {
    * Report a result back to Python as the verdict of this invocation.
    */
   private report<T>(results: WithView<InvocationResult<T>>[]) {
-    const message = {
+    const [message, buffers] = extractBuffers({
       identifier: this.message.identifier,
       results,
-    }
+    });
 
-    this.model.send(message, {});
+    this.model.send(message, {}, buffers);
   }
 
   /*
@@ -20,11 +20,45 @@
 // the typings of the pyodide NPM package.
 import type { loadPyodide, PyodideInterface, PyProxy } from "pyodide";
 import { AssetProvisioner } from "./Assets";
+import { BytecodeCache } from "./BytecodeCache";
+import { PythonWorker } from "./PythonWorker";
 
 import { JavaScriptLoader } from "./JavaScriptLoader";
 import * as ipymuvue_js from "./ipymuvue_js";
 
-const PYODIDE_CDN = "https://cdn.jsdelivr.net/pyodide/v0.21.0a3/full";
+const version = require('../package.json').version;
+
+// This version must match PYODIDE_VERSION in ipymuvue/server.py
+const PYODIDE_VERSION = "0.21.0a3";
+
+const PYODIDE_CDN = `https://cdn.jsdelivr.net/pyodide/v${PYODIDE_VERSION}/full/`;
+
+/*
+ * Return the base URL of the Jupyter server serving this page.
+ */
+function jupyterBaseUrl(): string {
+  const config = document.getElementById("jupyter-config-data");
+  const baseUrl = config == null ? "/" : (JSON.parse(config.textContent || "{}").baseUrl || "/");
+  return new URL(baseUrl, window.location.href).href;
+}
+
+/*
+ * Return the URL of the pyodide distribution served by the Jupyter server
+ * (see ipymuvue/server.py) or null if the server does not serve pyodide.
+ */
+async function localPyodide(): Promise<string | null> {
+  const indexURL = new URL(`ipymuvue/pyodide/${PYODIDE_VERSION}/`, jupyterBaseUrl()).href;
+
+  try {
+    const response = await fetch(`${indexURL}pyodide.js`, { method: "HEAD" });
+    if (response.ok)
+      return indexURL;
+  } catch(e) {
+    // The server is not reachable, so we cannot load from it.
+  }
+
+  return null;
+}
 
 /*
  * A Python interpreter powered by pyodide.
@@ -36,11 +70,82 @@ const PYODIDE_CDN = "https://cdn.jsdelivr.net/pyodide/v0.21.0a3/full";
 export class PythonInterpreter {
   private static instance: Promise<PyodideInterface> | null = null;
 
+  /*
+   * The persistent cache of compiled Python modules, if available.
+   */
+  private static cache: BytecodeCache | null = null;
+
+  /*
+   * The URL of the pyodide distribution, if configured explicitly or once
+   * pyodide has been loaded.
+   */
+  private static indexURL: string | null = null;
+
+  /*
+   * Load pyodide from `indexURL` instead of autodetecting where to load it
+   * from.
+   *
+   * Relative URLs are resolved relative to the base URL of the Jupyter
+   * server. If no `indexURL` is configured, pyodide is loaded from the
+   * Jupyter server if it serves pyodide and from a CDN otherwise.
+   *
+   * This has no effect once the interpreter has been loaded.
+   */
+  public static configure(indexURL: string | null) {
+    if (!indexURL)
+      return;
+
+    indexURL = new URL(indexURL, jupyterBaseUrl()).href;
+    if (!indexURL.endsWith("/"))
+      indexURL += "/";
+
+    if (indexURL === PythonInterpreter.indexURL)
+      return;
+
+    if (PythonInterpreter.instance != null) {
+      console.warn(`ignoring request to load pyodide from ${indexURL} since pyodide has already been loaded`);
+      return;
+    }
+
+    PythonInterpreter.indexURL = indexURL;
+  }
+
   /*
    * Absolute paths of all the files provisioned.
    */
   private static provisioned = new Set<string>();
 
+  /*
+   * A counter that increases whenever a file is provisioned or replaced.
+   */
+  public static revision = 0;
+
+  /*
+   * Return the URL pyodide has been loaded from and the content of all the
+   * files provisioned so far indexed by their absolute path (unless nothing
+   * has been provisioned since the revision `since`.)
+   *
+   * A PythonWorker uses this to set up a copy of this interpreter.
+   */
+  public async distribution(since?: number): Promise<{ indexURL: string, revision: number, files: Record<string, Uint8Array> | null }> {
+    const pyodide = await this.pyodide;
+
+    let files: Record<string, Uint8Array> | null = null;
+
+    // Only collect the files if something changed since revision `since`.
+    if (since !== PythonInterpreter.revision) {
+      files = {};
+      for (const abspath of PythonInterpreter.provisioned)
+        files[abspath] = pyodide.FS.readFile(abspath);
+    }
+
+    return {
+      indexURL: PythonInterpreter.indexURL!,
+      revision: PythonInterpreter.revision,
+      files,
+    };
+  }
+
   /*
    * Create the named assets in the emscription file system.
    *
@@ -57,6 +162,9 @@ export class PythonInterpreter {
     for (const [name, content] of Object.entries(assets)) {
       const provisioned = await provisioner.provision(name, content)
 
+      if (provisioned.replaced || !PythonInterpreter.provisioned.has(provisioned.abspath))
+        PythonInterpreter.revision++;
+
       PythonInterpreter.provisioned.add(provisioned.abspath);
 
       if (provisioned.replaced) {
@@ -92,6 +200,17 @@ export class PythonInterpreter {
     }
   }
 
+  /*
+   * Import the Python module `name` and persist its compiled bytecode so
+   * that it can be imported faster after the page has been reloaded.
+   */
+  public async import(name: string): Promise<PyProxy> {
+    const pyodide = await this.pyodide;
+    const module = pyodide.pyimport(name);
+    PythonInterpreter.cache?.persist();
+    return module;
+  }
+
   private get modules(): Promise<Record<string, [string, PyProxy]>> {
     return (async () => {
       const modules: Record<string, [string, PyProxy]> = {};
@@ -106,18 +225,77 @@ export class PythonInterpreter {
   }
 
 
+  /*
+   * Start loading pyodide when the browser is idle.
+   *
+   * This is called as soon as a widget with Python components is created so
+   * that the interpreter is (hopefully) ready when the components render.
+   */
+  public static preload() {
+    if (PythonInterpreter.instance != null || PythonInterpreter.preloading)
+      return;
+
+    PythonInterpreter.preloading = true;
+    PythonInterpreter.mark("preload");
+
+    const load = () => { new PythonInterpreter().pyodide; };
+
+    const globals = window as any;
+    if (typeof globals.requestIdleCallback === "function")
+      globals.requestIdleCallback(load, { timeout: 2000 });
+    else
+      setTimeout(load, 0);
+  }
+
+  private static preloading = false;
+
+  /*
+   * The stages of loading pyodide (`preload`, `load`, `script`,
+   * `interpreter`, `ready`) with the time in milliseconds since the page
+   * was loaded when they were reached.
+   *
+   * The same stages are recorded as `ipymuvue:pyodide:<stage>` marks with the
+   * Performance API so they show up in the browser's profiler.
+   */
+  public static readonly timeline: Record<string, number> = {};
+
+  private static mark(stage: string) {
+    PythonInterpreter.timeline[stage] = performance.now();
+    performance.mark(`ipymuvue:pyodide:${stage}`);
+  }
+
   public get pyodide(): Promise<PyodideInterface> {
     if (PythonInterpreter.instance == null)
       PythonInterpreter.instance = (async () => {
-        const pyodide = await new JavaScriptLoader("pyodide", `${PYODIDE_CDN}/pyodide.js`).object;
+        PythonInterpreter.mark("load");
+
+        const indexURL = PythonInterpreter.indexURL || await localPyodide() || PYODIDE_CDN;
+        PythonInterpreter.indexURL = indexURL;
+
+        const pyodide = await new JavaScriptLoader("pyodide", `${indexURL}pyodide.js`).object;
+
+        PythonInterpreter.mark("script");
 
         const loadPyodideBrowser: typeof loadPyodide = pyodide.loadPyodide;
 
         const instance = await loadPyodideBrowser({
-          indexURL: `${PYODIDE_CDN}/`,
+          indexURL,
         });
 
+        PythonInterpreter.mark("interpreter");
+
         instance.registerJsModule("ipymuvue_js", ipymuvue_js);
+        instance.registerJsModule("ipymuvue_worker", {
+          call: (module: string, name: string, args: any[]) => PythonWorker.call(this, module, name, args),
+        });
+
+        const cache = new BytecodeCache(instance, `${version}-${PYODIDE_VERSION}`);
+        if (await cache.mount())
+          PythonInterpreter.cache = cache;
+
+        PythonInterpreter.mark("ready");
+        performance.measure("ipymuvue:pyodide", "ipymuvue:pyodide:load", "ipymuvue:pyodide:ready");
+        console.debug(`loaded pyodide from ${indexURL} in ${Math.round(PythonInterpreter.timeline.ready - PythonInterpreter.timeline.load)}ms`);
 
         return instance;
       })();
@@ -0,0 +1,162 @@
+/* ******************************************************************************
+ * Copyright (c) 2022 Julian Rüth <julian.rueth@fsfe.org>
+ *
+ * ipymuvue is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * ipymuvue is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with ipymuvue. If not, see <https://www.gnu.org/licenses/>.
+ * ******************************************************************************/
+
+import type { PythonInterpreter } from "./PythonInterpreter";
+
+/*
+ * The code running in the Web Worker.
+ *
+ * It loads its own copy of pyodide, writes the files provisioned in the main
+ * interpreter to its file system, and then runs Python functions on request.
+ * Arguments and results are copied between the threads with the structured
+ * clone algorithm.
+ */
+const WORKER = `
+let pyodide = null;
+let run = null;
+
+async function setup(indexURL) {
+  importScripts(indexURL + "pyodide.js");
+  pyodide = await loadPyodide({ indexURL });
+  pyodide.runPython([
+    "import importlib, inspect, sys",
+    "import js",
+    "from pyodide.ffi import to_js",
+    "def __ipymuvue_invalidate(paths):",
+    "    paths = set(paths)",
+    "    for (name, module) in list(sys.modules.items()):",
+    "        if getattr(module, '__file__', None) in paths:",
+    "            del sys.modules[name]",
+    "    importlib.invalidate_caches()",
+    "async def __ipymuvue_run(module, name, args):",
+    "    result = getattr(importlib.import_module(module), name)(*args.to_py())",
+    "    if inspect.isawaitable(result):",
+    "        result = await result",
+    "    return to_js(result, dict_converter=js.Object.fromEntries)",
+  ].join("\\n"));
+  run = pyodide.globals.get("__ipymuvue_run");
+}
+
+function provision(files) {
+  for (const [path, content] of Object.entries(files)) {
+    pyodide.FS.mkdirTree(path.substring(0, path.lastIndexOf("/")));
+    pyodide.FS.writeFile(path, content);
+  }
+
+  const invalidate = pyodide.globals.get("__ipymuvue_invalidate");
+  invalidate(Object.keys(files));
+  invalidate.destroy();
+}
+
+self.onmessage = async (event) => {
+  const { identifier, indexURL, files, module, name, args } = event.data;
+  try {
+    if (pyodide == null)
+      await setup(indexURL);
+    if (files != null)
+      provision(files);
+    let result = await run(module, name, args);
+    if (result != null && typeof result.destroy === "function") {
+      const proxy = result;
+      result = proxy.toJs();
+      proxy.destroy();
+    }
+    self.postMessage({ identifier, result });
+  } catch (e) {
+    self.postMessage({ identifier, error: String(e) });
+  }
+};
+`;
+
+/*
+ * A second Python interpreter running in a Web Worker.
+ *
+ * Python components can use it (through `ipymuvue.pyodide.worker.call`) to
+ * run CPU heavy functions without blocking the browser's main thread. The
+ * worker has a copy of all the Python files provisioned in the main
+ * interpreter but shares no state with it.
+ */
+export class PythonWorker {
+  private static instance: PythonWorker | null = null;
+
+  private readonly worker: Worker;
+
+  // The revision of the provisioned files the worker has seen, see
+  // PythonInterpreter.distribution().
+  private revision: number | undefined = undefined;
+
+  private nextIdentifier = 0;
+
+  private readonly pending = new Map<number, { resolve: (value: any) => void, reject: (reason: any) => void }>();
+
+  private constructor() {
+    const url = URL.createObjectURL(new Blob([WORKER], { type: "text/javascript" }));
+    this.worker = new Worker(url);
+    URL.revokeObjectURL(url);
+
+    this.worker.onmessage = (event: MessageEvent) => {
+      const { identifier, result, error } = event.data;
+
+      const pending = this.pending.get(identifier);
+      if (pending === undefined)
+        return;
+      this.pending.delete(identifier);
+
+      if (error !== undefined)
+        pending.reject(Error(error));
+      else
+        pending.resolve(result);
+    };
+  }
+
+  /*
+   * Call the function `name` of the Python module `module` with `args` in
+   * the worker and return its result.
+   *
+   * The arguments and the result must be JSON-like data or typed arrays.
+   */
+  public static async call(interpreter: PythonInterpreter, module: string, name: string, args: any[]): Promise<any> {
+    if (PythonWorker.instance == null)
+      PythonWorker.instance = new PythonWorker();
+
+    return await PythonWorker.instance.call(interpreter, module, name, args);
+  }
+
+  private async call(interpreter: PythonInterpreter, module: string, name: string, args: any[]): Promise<any> {
+    const { indexURL, revision, files } = await interpreter.distribution(this.revision);
+    this.revision = revision;
+
+    const identifier = this.nextIdentifier++;
+
+    try {
+      return await new Promise((resolve, reject) => {
+        this.pending.set(identifier, { resolve, reject });
+        try {
+          this.worker.postMessage({ identifier, indexURL, files, module, name, args });
+        } catch (e) {
+          this.pending.delete(identifier);
+          throw e;
+        }
+      });
+    } catch (e) {
+      // We cannot tell whether the worker received the files, so we send all
+      // of them with the next call.
+      this.revision = undefined;
+      throw e;
+    }
+  }
+}
@@ -0,0 +1,153 @@
+/* ******************************************************************************
+ * Copyright (c) 2022 Julian Rüth <julian.rueth@fsfe.org>
+ *
+ * ipymuvue is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * ipymuvue is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with ipymuvue. If not, see <https://www.gnu.org/licenses/>.
+ * ******************************************************************************/
+
+const version = require('../package.json').version;
+
+/*
+ * The prefix of the names of the Cache Storages of remote imports.
+ */
+const PREFIX = "ipymuvue-remote-imports";
+
+/*
+ * The name of the Cache Storage holding remote imports across page loads.
+ * The storage is specific to this version of ipymuvue, storages of other
+ * versions are deleted, see `open`.
+ */
+const CACHE = `${PREFIX}-${version}`;
+
+/*
+ * The remote imports requested so far in this page indexed by their URL.
+ * Concurrent requests for the same URL share a single download.
+ */
+const downloads = new Map<string, Promise<string>>();
+
+/*
+ * A URL prefix that remote imports are routed through, see `configureMirror`.
+ */
+let mirror: string | null = null;
+
+/*
+ * Route remote imports through `prefix`, i.e., load `https://host/path` from
+ * `${prefix}host/path` instead. An empty `prefix` loads remote imports from
+ * their original location.
+ */
+export function configureMirror(prefix: string | null) {
+  if (prefix && !prefix.endsWith("/"))
+    prefix += "/";
+
+  if ((prefix || null) === mirror)
+    return;
+
+  mirror = prefix || null;
+  downloads.clear();
+}
+
+/*
+ * Return the content of the remote import `url`.
+ *
+ * The content is cached in memory and, if available, in the browser's Cache
+ * Storage so that it is only downloaded once.
+ */
+export function fetchRemote(url: string): Promise<string> {
+  let download = downloads.get(url);
+
+  if (download === undefined) {
+    download = load(url);
+    downloads.set(url, download);
+
+    // Do not cache failures so that we can retry later.
+    download.catch(() => {
+      if (downloads.get(url) === download)
+        downloads.delete(url);
+    });
+  }
+
+  return download;
+}
+
+/*
+ * Return the content of the remote import `url` from Cache Storage or
+ * download it.
+ *
+ * When the content is taken from Cache Storage, it is revalidated in the
+ * background so that changes to `url` show up on the next page load.
+ */
+async function load(url: string): Promise<string> {
+  const source = mirror == null ? url : `${mirror}${url.replace(/^https:\/\//, "")}`;
+
+  const cache = await open();
+
+  if (cache != null) {
+    const cached = await cache.match(source);
+    if (cached !== undefined) {
+      download(url, source, cache, "no-cache").catch((e) => console.warn(`cannot revalidate ${source}`, e));
+      return await cached.text();
+    }
+  }
+
+  return await (await download(url, source, cache, "default")).text();
+}
+
+/*
+ * Download the remote import `url` from `source` and store it in `cache`.
+ */
+async function download(url: string, source: string, cache: Cache | null, mode: RequestCache): Promise<Response> {
+  const response = await fetch(source, { cache: mode });
+
+  if (!response.ok)
+    throw Error(`cannot load ${url} from ${source}: ${response.status} ${response.statusText}`);
+
+  if (cache != null) {
+    try {
+      await cache.put(source, response.clone());
+    } catch (e) {
+      console.warn(`cannot cache ${source}`, e);
+    }
+  }
+
+  return response;
+}
+
+/*
+ * The Cache Storage for remote imports, see `open`.
+ */
+let opened: Promise<Cache | null> | null = null;
+
+/*
+ * Return the Cache Storage for remote imports or null if it is not available,
+ * e.g., because the page is not served over a secure connection.
+ */
+function open(): Promise<Cache | null> {
+  if (opened === null)
+    opened = openCache();
+  return opened;
+}
+
+async function openCache(): Promise<Cache | null> {
+  if (typeof caches === "undefined")
+    return null;
+
+  try {
+    for (const name of await caches.keys())
+      if (name.startsWith(PREFIX) && name !== CACHE)
+        await caches.delete(name);
+
+    return await caches.open(CACHE);
+  } catch (e) {
+    return null;
+  }
+}
@@ -0,0 +1,80 @@
+/* ******************************************************************************
+ * Copyright (c) 2022 Julian Rüth <julian.rueth@fsfe.org>
+ *
+ * ipymuvue is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * ipymuvue is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with ipymuvue. If not, see <https://www.gnu.org/licenses/>.
+ * ******************************************************************************/
+
+/*
+ * A column of a chunk of rows streamed from the backend. Numeric columns are
+ * sent as a binary buffer, all other columns as plain JSON values.
+ */
+type Column = { name: string | null } & (
+  { dtype: "float64", buffer: number } |
+  { values: any[] }
+);
+
+/*
+ * A chunk of rows streamed from the backend with VueWidget.stream().
+ */
+export type StreamChunk = {
+  // The number of rows in this chunk.
+  length: number,
+  // Whether the rows are scalars, i.e., there is a single column and rows
+  // should not be objects.
+  scalar: boolean,
+  columns: Column[],
+};
+
+/*
+ * Return the rows encoded in the columnar `chunk` whose binary data is stored
+ * in `buffers`.
+ */
+export function decode(chunk: StreamChunk, buffers: DataView[]): any[] {
+  const columns = chunk.columns.map((column): ArrayLike<any> => {
+    if ("values" in column)
+      return column.values;
+
+    const view = buffers[column.buffer];
+
+    // The buffer is not necessarily aligned for a Float64Array, so we copy it.
+    return new Float64Array(view.buffer.slice(view.byteOffset, view.byteOffset + view.byteLength));
+  });
+
+  if (chunk.scalar)
+    return Array.from(columns[0]);
+
+  const rows = new Array(chunk.length);
+  for (let i = 0; i < chunk.length; i++)
+    rows[i] = Object.fromEntries(chunk.columns.map((column, c) => [column.name, columns[c][i]]));
+
+  return rows;
+}
+
+/*
+ * Append `rows` to `target` in place and drop the first entries of `target`
+ * so it has at most `maxlen` entries.
+ */
+export function append(target: any[], rows: any[], maxlen: number | null) {
+  if (maxlen != null && rows.length > maxlen)
+    rows = rows.slice(rows.length - maxlen);
+
+  // Do not push everything at once since the number of arguments to a
+  // function is limited.
+  const batch = 1 << 14;
+  for (let i = 0; i < rows.length; i += batch)
+    target.push(...rows.slice(i, i + batch));
+
+  if (maxlen != null && target.length > maxlen)
+    target.splice(0, target.length - maxlen);
+}
@@ -0,0 +1,65 @@
+/* ******************************************************************************
+ * Copyright (c) 2022 Julian Rüth <julian.rueth@fsfe.org>
+ *
+ * ipymuvue is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * ipymuvue is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with ipymuvue. If not, see <https://www.gnu.org/licenses/>.
+ * ******************************************************************************/
+
+/*
+ * The owner of styles that are never released, e.g., styles of components
+ * compiled without an owner.
+ */
+const PERMANENT = {};
+
+/*
+ * The <style> elements in the document indexed by their content together with
+ * the number of times each owner requested them.
+ */
+const styles = new Map<string, { element: HTMLStyleElement, owners: Map<object, number> }>();
+
+/*
+ * Add a <style> element with `textContent` to the document on behalf of
+ * `owner` (typically a view.)
+ *
+ * If there is already such an element, it is reused. The element is removed
+ * when all its owners called `releaseStyles`.
+ */
+export function addStyle(textContent: string, owner: object = PERMANENT) {
+  let style = styles.get(textContent);
+
+  if (style === undefined) {
+    const element = Object.assign(document.createElement('style'), {textContent});
+    document.head.appendChild(element);
+
+    style = { element, owners: new Map() };
+    styles.set(textContent, style);
+  }
+
+  style.owners.set(owner, (style.owners.get(owner) || 0) + 1);
+}
+
+/*
+ * Release all the styles added on behalf of `owner` and remove the ones that
+ * have no owners left from the document.
+ */
+export function releaseStyles(owner: object) {
+  for (const [textContent, style] of styles) {
+    if (!style.owners.delete(owner))
+      continue;
+
+    if (style.owners.size === 0) {
+      style.element.remove();
+      styles.delete(textContent);
+    }
+  }
+}
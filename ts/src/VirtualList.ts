@@ -0,0 +1,191 @@
+/* ******************************************************************************
+ * Copyright (c) 2022 Julian Rüth <julian.rueth@fsfe.org>
+ *
+ * ipymuvue is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * ipymuvue is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with ipymuvue. If not, see <https://www.gnu.org/licenses/>.
+ * ******************************************************************************/
+
+import { defineComponent, h, markRaw } from "vue";
+import type { PropType } from "vue";
+import type { VueWidgetModel } from "./VueWidgetModel";
+
+/*
+ * The state of a VirtualList traitlet as it is synchronized from the backend.
+ */
+export type VirtualListSource = {
+  // The name of the traitlet on the backend.
+  name: string,
+  // The number of items in the list.
+  length: number,
+  // Changes whenever the backend sends a new list.
+  version: number,
+};
+
+/*
+ * Return a component that renders the visible part of a VirtualList of the
+ * `model`.
+ *
+ * The items are requested from the backend in pages of `pageSize` items. Only
+ * the pages that overlap the visible area (extended by `prefetch` items in
+ * both directions) are requested and kept in memory.
+ */
+export function virtualList(model: VueWidgetModel) {
+  return defineComponent({
+    name: "IpymuvueVirtualList",
+    props: {
+      // The VirtualList traitlet to render.
+      source: { type: Object as PropType<VirtualListSource>, required: true },
+      // The height of each item in pixels.
+      itemHeight: { type: Number, required: true },
+      // The height of the visible area in pixels.
+      height: { type: Number, required: true },
+      // The number of items to request before and after the visible area;
+      // defaults to the number of visible items.
+      prefetch: { type: Number as PropType<number | null>, default: null },
+      // The number of items to request from the backend at once.
+      pageSize: { type: Number, default: 128 },
+    },
+    data() {
+      return {
+        scrollTop: 0,
+        // Maps page number -> items on that page.
+        pages: {} as Record<number, any[]>,
+        // The pages that have been requested but not received yet. Not
+        // reactive since nothing renders differently for them.
+        requested: markRaw(new Set<number>()),
+      };
+    },
+    computed: {
+      // The first visible item.
+      first(): number {
+        return Math.min(Math.floor(this.scrollTop / this.itemHeight), this.source.length);
+      },
+      // One past the last visible item.
+      last(): number {
+        return Math.min(this.first + Math.ceil(this.height / this.itemHeight) + 1, this.source.length);
+      },
+      // The range of pages that should be in memory.
+      window(): [number, number] {
+        const prefetch = this.prefetch ?? (this.last - this.first);
+        return [
+          Math.floor(Math.max(this.first - prefetch, 0) / this.pageSize),
+          Math.floor(Math.max(Math.min(this.last + prefetch, this.source.length) - 1, 0) / this.pageSize),
+        ];
+      },
+    },
+    watch: {
+      "source.version": {
+        handler() {
+          this.pages = {};
+          this.requested.clear();
+          this.fetch();
+        },
+      },
+      window: {
+        handler() {
+          this.fetch();
+        },
+        immediate: true,
+      },
+    },
+    methods: {
+      /*
+       * Request the pages in the current window that are missing and drop
+       * the pages outside of it.
+       */
+      fetch() {
+        const [start, end] = this.window;
+
+        for (const page of Object.keys(this.pages).map(Number))
+          if (page < start || page > end)
+            delete this.pages[page];
+
+        for (let page = start; page <= end; page++)
+          if (!(page in this.pages) && !this.requested.has(page))
+            this.request(page);
+      },
+
+      /*
+       * Request the items on `page` from the backend.
+       */
+      async request(page: number) {
+        const version = this.source.version;
+
+        this.requested.add(page);
+
+        try {
+          const reply = await model.request({
+            window: this.source.name,
+            offset: page * this.pageSize,
+            limit: this.pageSize,
+          });
+
+          // Ignore replies for a list that has been replaced in the meantime.
+          if (version !== this.source.version)
+            return;
+
+          const [start, end] = this.window;
+          if (page >= start && page <= end)
+            this.pages[page] = reply.items;
+        } catch (e) {
+          // The page is requested again when the window changes.
+          console.error(`cannot load items of ${this.source.name}`, e);
+        } finally {
+          if (version === this.source.version)
+            this.requested.delete(page);
+        }
+      },
+
+      onScroll(event: Event) {
+        this.scrollTop = (event.target as HTMLElement).scrollTop;
+      },
+    },
+    render() {
+      const rows = [];
+
+      for (let index = this.first; index < this.last; index++) {
+        const page = this.pages[Math.floor(index / this.pageSize)];
+
+        rows.push(h("div", {
+          key: index,
+          style: {
+            position: "absolute",
+            top: `${index * this.itemHeight}px`,
+            height: `${this.itemHeight}px`,
+            left: 0,
+            right: 0,
+          },
+        }, this.$slots.default?.({
+          index,
+          item: page?.[index % this.pageSize],
+          loaded: page !== undefined,
+        })));
+      }
+
+      return h("div", {
+        style: {
+          height: `${this.height}px`,
+          overflowY: "auto",
+        },
+        onScroll: this.onScroll,
+      }, [
+        h("div", {
+          style: {
+            position: "relative",
+            height: `${this.source.length * this.itemHeight}px`,
+          },
+        }, rows),
+      ]);
+    },
+  });
+}
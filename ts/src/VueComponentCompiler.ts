@@ -20,18 +20,28 @@ import { defineAsyncComponent } from "vue";
 import { loadModule } from 'vue3-sfc-loader';
 import type { Options, Resource, AbstractPath } from 'vue3-sfc-loader';
 import { PythonInterpreter } from './PythonInterpreter';
+import { addStyle } from './Styles';
+import { fetchRemote } from './RemoteImports';
 import * as Vue from "vue";
 import isCallable from "is-callable";
 
 export class VueComponentCompiler {
-  public constructor(assets?: (name: string) => DataView | null);
-  public constructor(assets?: Record<string, DataView>);
-  public constructor(assets?: Record<string, DataView> | ((name: string) => DataView | null)) {
+  /*
+   * Create a compiler for components defined in `assets`.
+   *
+   * The styles defined by the compiled components are added to the document
+   * on behalf of `owner`, see Styles.ts.
+   */
+  public constructor(assets?: (name: string) => DataView | null, owner?: object);
+  public constructor(assets?: Record<string, DataView>, owner?: object);
+  public constructor(assets?: Record<string, DataView> | ((name: string) => DataView | null), owner?: object) {
     this.assets = assets || {};
+    this.owner = owner;
     this.pyodide = new PythonInterpreter();
   }
 
   private readonly assets;
+  private readonly owner;
   private readonly pyodide;
 
   public compile(filename: string): Component {
@@ -61,21 +71,18 @@ export class VueComponentCompiler {
                 return binary ? asset.buffer : new TextDecoder().decode(asset.buffer);
               }
 
-              if (path.startsWith("https://")) {
-                const raw = await fetch(path);
-                return await raw.text();
-              }
+              if (path.startsWith("https://"))
+                return await fetchRemote(path);
 
               throw Error(`cannot resolve ${path} from provided assets`);
             },
             type: path.includes('.') ? ("." + path.split('.').pop()!) : "",
           }
         },
-        addStyle(textContent) {
-          // We currently do not deduplicate styles. We should probably do that,
-          // in particular when we get hot-reloading.
-          const style = Object.assign(document.createElement('style'), {textContent});
-          document.head.appendChild(style);
+        addStyle: (textContent) => {
+          // Styles are shared between all the views that use them and
+          // removed once no view uses them anymore.
+          addStyle(textContent, this.owner);
         },
         handleModule: async(type, getContentData, path_) => {
           const path = path_.toString();
@@ -95,8 +102,7 @@ export class VueComponentCompiler {
 
               const name = path.replace(/\//g, '.').substring(0, path.length - 3);
 
-              const pyodide = await this.pyodide.pyodide;
-              return pyodide.pyimport(name);
+              return await this.pyodide.import(name);
             default:
               // Work around a typing error in vue3-sfc-loader.
               return undefined as unknown as null;
@@ -17,6 +17,10 @@
 
 import { DOMWidgetModel } from "@jupyter-widgets/base";
 import { Handler } from "./Invocation";
+import { append, decode } from "./Stream";
+import { extractBuffers, restoreBuffers } from "./Buffers";
+import { PythonInterpreter } from "./PythonInterpreter";
+import { configureMirror } from "./RemoteImports";
 
 const version = require('../package.json').version;
 
@@ -42,6 +46,10 @@ export class VueWidgetModel extends DOMWidgetModel {
             _VueWidget__components: {},
             /* files that can be used to define child components */
             _VueWidget__assets: {},
+            /* URL of the pyodide distribution, empty to autodetect */
+            _VueWidget__pyodide: '',
+            /* URL prefix to load https:// imports from, empty to load them directly */
+            _VueWidget__mirror: '',
             /* widgets for the (named) slots of the component */
             _VueWidget__children: {},
         };
@@ -50,12 +58,99 @@ export class VueWidgetModel extends DOMWidgetModel {
     constructor(...args: any[]) {
         super(...args);
 
-        this.on("msg:custom", (message: any) => {
+        PythonInterpreter.configure(this.get("_VueWidget__pyodide"));
+        configureMirror(this.get("_VueWidget__mirror"));
+
+        this.preload();
+        this.on("change:_VueWidget__assets", () => this.preload());
+
+        this.on("msg:custom", (message: any, buffers: DataView[]) => {
             if ("target" in message)
-              new Handler(this, message).run();
+              new Handler(this, restoreBuffers(message, buffers)).run();
+            else if ("stream" in message)
+              this.onStream(message.stream, decode(message.chunk, buffers), message.maxlen);
+            else if ("identifier" in message)
+              this.resolve(message);
         });
     }
 
+    /*
+     * Start loading pyodide in the background if this widget has components
+     * written in Python.
+     */
+    private preload() {
+      // The Python files of ipymuvue itself are shipped with every widget, so
+      // they do not count.
+      const assets = Object.keys(this.get("_VueWidget__assets") || {});
+      if (assets.some((name) => name.endsWith(".py") && !name.startsWith("ipymuvue/")))
+        PythonInterpreter.preload();
+    }
+
+    /*
+     * Append `rows` that have been streamed from the backend to the Stream
+     * traitlet `name`.
+     *
+     * The rows are appended to the model's state in place so that views
+     * created later see them. Existing views are notified with a `stream`
+     * event so they can update their Vue `data` in place.
+     */
+    private onStream(name: string, rows: any[], maxlen: number | null) {
+      const state = this.get(name);
+
+      if (!Array.isArray(state))
+        throw Error(`cannot stream into ${name} which is not a Stream`);
+
+      append(state, rows, maxlen);
+
+      this.trigger("stream", name, rows, maxlen);
+    }
+
+    /*
+     * Requests sent to the backend with `request` that are waiting for a
+     * reply; indexed by the identifier of the request.
+     */
+    private readonly pending = new Map<string, { resolve: (reply: any) => void, reject: (reason: any) => void }>();
+
+    /*
+     * Send `message` to the backend and return a promise that resolves to the
+     * backend's reply.
+     *
+     * The promise is rejected if the backend replies with an `error` or does
+     * not reply within `timeout` milliseconds, e.g., because the kernel died.
+     */
+    public request(message: Record<string, any>, timeout: number = 60000): Promise<any> {
+      const identifier = `${Date.now().toString(36)}-${Math.random().toString(36).substring(2)}`;
+
+      return new Promise((resolve, reject) => {
+        const timer = setTimeout(() => {
+          this.pending.delete(identifier);
+          reject(Error(`no reply from the kernel to request ${identifier}`));
+        }, timeout);
+
+        this.pending.set(identifier, {
+          resolve: (reply) => { clearTimeout(timer); resolve(reply); },
+          reject: (reason) => { clearTimeout(timer); reject(reason); },
+        });
+        this.send({...message, identifier}, this.callbacks());
+      });
+    }
+
+    /*
+     * Settle the pending `request` that `reply` answers.
+     */
+    private resolve(reply: any) {
+      const pending = this.pending.get(reply.identifier);
+      if (pending === undefined)
+        return;
+
+      this.pending.delete(reply.identifier);
+
+      if ("error" in reply)
+        pending.reject(Error(reply.error));
+      else
+        pending.resolve(reply);
+    }
+
     /*
      * Return the part of the model that defines its state, excluding bits that
      * are not supposed to change once the model has been created.
@@ -82,6 +177,7 @@ export class VueWidgetModel extends DOMWidgetModel {
      * Call `method` on the backend with `args`.
      */
     private callback(method: string, args: any[]) {
-      this.send({method, args}, this.callbacks());
+      const [message, buffers] = extractBuffers({method, args});
+      this.send(message, this.callbacks(), buffers);
     }
 }
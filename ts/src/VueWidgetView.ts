@@ -18,7 +18,10 @@
 import { DOMWidgetView, JupyterPhosphorWidget } from "@jupyter-widgets/base";
 import { VueWidgetModel } from "./VueWidgetModel";
 import { VueComponentCompiler } from "./VueComponentCompiler";
-import { createApp, defineComponent, h } from "vue";
+import { releaseStyles } from "./Styles";
+import { virtualList } from "./VirtualList";
+import { append } from "./Stream";
+import { createApp, defineComponent, h, toRaw } from "vue";
 import type { App, Component, ComponentPublicInstance } from "vue";
 import cloneDeep from "lodash-es/cloneDeep";
 import mapValues from "lodash-es/mapValues";
@@ -39,6 +42,15 @@ export class VueWidgetView extends DOMWidgetView {
     // The vnode representing the component.
     public vnode?: ComponentPublicInstance;
 
+    // The values most recently written into Vue's `data` from the model,
+    // indexed by model attribute. When Vue reports a change to exactly this
+    // value, the change originated in the model and must not be echoed back.
+    private readonly fromModel = new Map<string, unknown>();
+
+    // Whether this view has been removed. Compilation continues in the
+    // background after removal and might add styles on behalf of this view.
+    private removed = false;
+
     /*
      * Create a Vue App for this view and display it.
      */
@@ -57,7 +69,14 @@ export class VueWidgetView extends DOMWidgetView {
 
           const container = await this.container;
 
+          if (this.removed) {
+            // Release the styles that were added during compilation.
+            releaseStyles(this);
+            return;
+          }
+
           const app = createApp(() => h(container));
+          app.component("ipymuvue-virtual-list", virtualList(this.model));
           app.mount(mountPoint);
           this.app = app;
         })();
@@ -67,8 +86,12 @@ export class VueWidgetView extends DOMWidgetView {
      * Destroy the Vue App associated to this view.
      */
     public override remove() {
+        this.removed = true;
+
         this.app?.unmount();
 
+        releaseStyles(this);
+
         return super.remove();
     }
 
@@ -99,9 +122,13 @@ export class VueWidgetView extends DOMWidgetView {
               // Watch the Vue state: when it changes, update the model.
               this.$watch(key, () => self.onDataChange(key, this));
             }
+
+            // Append rows streamed from the backend in place.
+            self.listenTo(self.model, "stream", (key: string, rows: any[], maxlen: number | null) => self.onStream(key, rows, maxlen, this));
           },
           components: await new VueComponentCompiler(
-                              this.model.get('_VueWidget__assets')
+                              this.model.get('_VueWidget__assets'),
+                              this,
                             ).compileAsync(components),
           methods: model.methods,
         });
@@ -224,7 +251,17 @@ export class VueWidgetView extends DOMWidgetView {
      * `modelAttribute` attribute.
      */
     private onModelChange(modelAttribute: string, component: any, componentAttribute?: string) {
-      component[componentAttribute || modelAttribute] = cloneDeep(this.model.get(modelAttribute));
+      const value = cloneDeep(this.model.get(modelAttribute));
+      this.fromModel.set(modelAttribute, value);
+      component[componentAttribute || modelAttribute] = value;
+    }
+
+    /*
+     * Append `rows` to Vue's `data` because they have been streamed into the
+     * `attribute` of the widget's model.
+     */
+    private onStream(attribute: string, rows: any[], maxlen: number | null, component: any) {
+      append(component[attribute], cloneDeep(rows), maxlen);
     }
 
     /*
@@ -233,6 +270,14 @@ export class VueWidgetView extends DOMWidgetView {
      */
     private onDataChange(attribute: string, component: any) {
       const value = component[attribute];
+
+      // Do not send updates back to the kernel that the kernel just sent us.
+      // Vue wraps objects in a reactive proxy, so we compare the underlying
+      // raw object to what we wrote in onModelChange().
+      if (this.fromModel.has(attribute) && toRaw(value) === this.fromModel.get(attribute))
+        return;
+      this.fromModel.delete(attribute);
+
       this.model.set(attribute, value === undefined ? null : cloneDeep(value));
       this.model.save_changes();
     }
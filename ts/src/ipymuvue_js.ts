@@ -16,9 +16,12 @@
  * ******************************************************************************/
 
 export * as Vue from "vue";
+import { isRef, toRaw, unref } from "vue";
 
 export { default as cloneDeep } from "lodash-es/cloneDeep"
 export { default as clone } from "lodash-es/clone"
+export { append } from "./Stream";
+export { animate } from "./Animation";
 
 export function withArity(f: Function, n: number) {
   if (n === 2) {
@@ -31,9 +34,97 @@ export function withArity(f: Function, n: number) {
   throw Error("not implemented")
 }
 
-export function asVueCompatibleFunction(f: (...args: any) => any, createPyProxy: (obj: any) => any, vueCompatible: (obj: any) => any) {
+/*
+ * Return whether `x` is passed between Python and JavaScript by value, i.e.,
+ * whether pyodide converts it without creating a proxy.
+ */
+function isPrimitive(x: any) {
+  return x === null || x === undefined || ["number", "string", "boolean", "bigint"].includes(typeof x);
+}
+
+/*
+ * Return a version of the Python function `f` that can be called by Vue.
+ *
+ * If `fields` is set, the first argument (typically a DOM event) is replaced
+ * by the values of these fields. This way, no Python wrapper of the event
+ * needs to be created.
+ */
+export function asVueCompatibleFunction(f: (...args: any) => any, createPyProxy: (obj: any) => any, vueCompatible: (obj: any) => any, fields?: string[]) {
   function g(...args: any[]) {
-    return vueCompatible(f(...args.map((arg) => createPyProxy(arg))));
+    if (fields != null) {
+      const event = args[0];
+      args = [...fields.map((field) => event?.[field]), ...args.slice(1)];
+    }
+
+    // Only call into Python to wrap arguments and convert the result if they
+    // are not primitives that need no conversion.
+    const result = f(...args.map((arg) => isPrimitive(arg) ? arg : createPyProxy(arg)));
+    return isPrimitive(result) ? result : vueCompatible(result);
   }
   return g
 }
+
+/*
+ * Return a deep copy of `x` that consists of plain arrays and objects only,
+ * i.e., without any Vue proxies or refs, so that pyodide can convert it to
+ * Python lists and dicts in a single `to_py()` call.
+ *
+ * The entries are read through the Vue proxies so that a computed or watch
+ * calling this tracks all of them. Objects that occur several times in `x`
+ * (including cycles) are copied once and the copy is shared.
+ */
+export function toPlain(x: any, copies: Map<object, any> = new Map()): any {
+  if (isRef(x))
+    return toPlain(unref(x), copies);
+
+  if (x === null || typeof x !== "object" || ArrayBuffer.isView(x))
+    return x;
+
+  const raw = toRaw(x);
+
+  let copy = copies.get(raw);
+  if (copy !== undefined)
+    return copy;
+
+  copy = Array.isArray(x) ? new Array(x.length) : {};
+  copies.set(raw, copy);
+
+  for (const [key, value] of Object.entries(x))
+    copy[key] = toPlain(value, copies);
+
+  return copy;
+}
+
+/*
+ * Identifiers of JavaScript objects, see `identify`.
+ */
+const identifiers = new WeakMap<object, number>();
+let nextIdentifier = 0;
+
+/*
+ * Return a number that identifies the object `x`.
+ *
+ * Python cannot compare the identity of JavaScript objects directly since
+ * pyodide creates a new JsProxy every time an object crosses into Python.
+ */
+export function identify(x: object): number {
+  let identifier = identifiers.get(x);
+
+  if (identifier === undefined) {
+    identifier = nextIdentifier++;
+    identifiers.set(x, identifier);
+  }
+
+  return identifier;
+}
+
+/*
+ * Set `targets[i][keys[i]] = values[i]` for all `i`.
+ *
+ * Python collects writes to reactive objects in a `batch()` and performs
+ * them with a single call so that Vue only schedules one update.
+ */
+export function applyBatch(targets: any[], keys: string[], values: any[]) {
+  for (let i = 0; i < targets.length; i++)
+    targets[i][keys[i]] = values[i];
+}